@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import Post, Category, Location, Comment
+from django.db.models import Q
+from .admin_filters import AutocompleteFilter
+from .models import Post, Category, Location, Comment, ImageJob
+from .pagination import EstimatedCountPaginator
+from .search import filter_matching
 
 
 @admin.register(Post)
@@ -12,15 +16,18 @@ class PostAdmin(admin.ModelAdmin):
         "location",
         "is_published",
     )
+    list_select_related = ("author", "category", "location")
     list_filter = (
         "is_published",
         "pub_date",
         "category",
-        "location",
-        "author",
+        ("location", AutocompleteFilter),
+        ("author", AutocompleteFilter),
     )
     search_fields = ("title", "text")
-    date_hierarchy = "pub_date"
+    autocomplete_fields = ("author", "category", "location")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     ordering = ("-pub_date",)
     fieldsets = (
         (
@@ -39,12 +46,24 @@ class PostAdmin(admin.ModelAdmin):
         (
             "Дополнительно",
             {
-                "fields": ("pub_date", "created_at"),
+                "fields": ("pub_date", "created_at", "updated_at"),
                 "classes": ("collapse",),
             },
         ),
     )
-    readonly_fields = ("created_at",)
+    readonly_fields = ("created_at", "updated_at")
+
+    @property
+    def media(self):
+        return super().media + AutocompleteFilter.media(
+            Post._meta.get_field("author"), self.admin_site
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск по полнотекстовому индексу вместо LIKE по title и text.
+        if not search_term.strip():
+            return queryset, False
+        return filter_matching(queryset, search_term), False
 
 
 @admin.register(Category)
@@ -69,5 +88,40 @@ class LocationAdmin(admin.ModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('author', 'post', 'created_at', 'text')
+    list_select_related = ("author", "post")
     search_fields = ('author__username', 'text')
     list_filter = ('created_at',)
+    autocomplete_fields = ("author",)
+    raw_id_fields = ("post",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        # Текст ищется по полнотекстовому индексу вместо LIKE по всей
+        # таблице комментариев; авторов мало, их имена — по началу.
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        found = filter_matching(queryset, search_term).values("pk")
+        return (
+            queryset.filter(
+                Q(pk__in=found) | Q(author__username__istartswith=search_term)
+            ),
+            False,
+        )
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ("image", "post", "status", "attempts", "created_at")
+    list_select_related = ("post",)
+    list_filter = ("status",)
+    readonly_fields = (
+        "post",
+        "image",
+        "attempts",
+        "error",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
@@ -0,0 +1,57 @@
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.forms import Media
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """Фильтр по внешнему ключу с выбором через автодополнение.
+
+    RelatedFieldListFilter выводит в боковую панель все объекты связанной
+    модели; здесь варианты подгружаются по мере ввода из admin:autocomplete,
+    а из базы читается только выбранный объект. Связанной модели нужен
+    ModelAdmin с search_fields.
+    """
+
+    template = "admin/blog/autocomplete_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f"{field_path}__{field.target_field.name}__exact"
+        self.lookup_val = params.get(self.lookup_kwarg)
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+        self.app_label = model._meta.app_label
+        self.model_name = model._meta.model_name
+        self.field_name = field.name
+        self.selected = None
+        if self.lookup_val:
+            try:
+                self.selected = (
+                    field.remote_field.model._default_manager.filter(
+                        pk=self.lookup_val
+                    ).first()
+                )
+            except (ValueError, TypeError):
+                pass
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.lookup_val is None,
+            "query_string": changelist.get_query_string(
+                remove=[self.lookup_kwarg]
+            ),
+            "display": "Все",
+        }
+
+    @staticmethod
+    def media(field, admin_site):
+        """Скрипты select2 и переход по выбранному значению."""
+        return AutocompleteSelect(field, admin_site).media + Media(
+            js=["js/admin_filters.js"]
+        )
@@ -0,0 +1,181 @@
+"""Доступный только для чтения JSON API лент.
+
+Посты выбираются по той же материализованной ленте, что и HTML-ленты
+(blog.feed), но без шаблонов и без экземпляров моделей: из базы читаются
+только колонки запрошенных полей (?fields=), а постраничный вывод идёт по
+курсору.
+"""
+
+import json
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from . import feed
+from .conditional import conditional_page
+from .images import image_storage
+from .models import Category, Post
+from .pagination import CursorPaginator, decode_cursor
+from .views import _category_feed, _index_feed, _profile_feed
+
+try:
+    import orjson
+except ImportError:  # orjson — необязательная зависимость
+    orjson = None
+
+
+def _location(row):
+    if row.location__name and row.location__is_published:
+        return row.location__name
+    return None
+
+
+def _image(row):
+    return image_storage().url(row.image) if row.image else None
+
+
+# Поле ответа: (колонки для values_list, функция от строки результата).
+FIELDS = {
+    "id": (("id",), lambda row: row.id),
+    "url": (
+        ("id",),
+        lambda row: reverse("blog:post_detail", args=[row.id]),
+    ),
+    "title": (("title",), lambda row: row.title),
+    "text": (("text",), lambda row: row.text),
+    "pub_date": (("pub_date",), lambda row: row.pub_date.isoformat()),
+    "author": (("author__username",), lambda row: row.author__username),
+    "category": (
+        ("category__slug", "category__title"),
+        lambda row: {"slug": row.category__slug, "title": row.category__title},
+    ),
+    "location": (("location__name", "location__is_published"), _location),
+    "image": (("image",), _image),
+    "comment_count": (("comment_count",), lambda row: row.comment_count),
+}
+# Без них не построить курсор следующей страницы.
+CURSOR_COLUMNS = ("id", "pub_date")
+
+
+class BadRequest(Exception):
+    pass
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        dumps(data), status=status, content_type="application/json"
+    )
+
+
+def requested_fields(request):
+    raw = request.GET.get("fields")
+    if not raw:
+        return list(FIELDS)
+    fields = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown or not fields:
+        raise BadRequest(
+            "Неизвестные поля: {}. Доступны: {}.".format(
+                ", ".join(unknown) or "—", ", ".join(FIELDS)
+            )
+        )
+    return fields
+
+
+def page_size(request):
+    raw = request.GET.get("limit")
+    if raw is None:
+        return settings.BLOG_API_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise BadRequest("limit должен быть числом.")
+    return max(1, min(limit, settings.BLOG_API_MAX_PAGE_SIZE))
+
+
+def _page_url(request, cursor):
+    params = {
+        key: value for key, value in request.GET.items() if key != "cursor"
+    }
+    params["cursor"] = cursor
+    return f"{request.path}?{urlencode(params)}"
+
+
+def feed_response(request, entries):
+    """Страница ленты `entries` в JSON: {"results", "next", "previous"}.
+
+    `entries` — записи blog.feed.entries.
+    """
+    try:
+        fields = requested_fields(request)
+        limit = page_size(request)
+        token = request.GET.get("cursor")
+        if token and decode_cursor(token) is None:
+            raise BadRequest("Неверный курсор.")
+    except BadRequest as error:
+        return json_response({"error": str(error)}, status=400)
+
+    columns = dict.fromkeys(CURSOR_COLUMNS)
+    for name in fields:
+        columns.update(dict.fromkeys(FIELDS[name][0]))
+    rows = Post.objects.values_list(*columns, named=True)
+    page = CursorPaginator(
+        entries, limit, load=lambda entries: feed.posts_for(entries, rows)
+    ).get_page(token)
+
+    getters = [(name, FIELDS[name][1]) for name in fields]
+    return json_response(
+        {
+            "results": [
+                {name: getter(row) for name, getter in getters} for row in page
+            ],
+            "next": (
+                _page_url(request, page.next_cursor)
+                if page.has_next()
+                else None
+            ),
+            "previous": (
+                _page_url(request, page.previous_cursor)
+                if page.has_previous()
+                else None
+            ),
+        }
+    )
+
+
+@require_safe
+@conditional_page(feed=_index_feed, tags=["feed", "catalog"])
+def posts(request):
+    return feed_response(request, feed.entries())
+
+
+@require_safe
+@conditional_page(feed=_category_feed, tags=["feed", "catalog"])
+def category_posts(request, category_slug):
+    category = get_object_or_404(
+        Category, slug=category_slug, is_published=True
+    )
+    return feed_response(request, feed.entries(category_id=category.pk))
+
+
+@require_safe
+@conditional_page(feed=_profile_feed, tags=["feed", "catalog"])
+def profile_posts(request, username):
+    author = get_object_or_404(User, username=username)
+    return feed_response(
+        request,
+        feed.entries(
+            published=request.user.username != username, author_id=author.pk
+        ),
+    )
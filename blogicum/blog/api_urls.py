@@ -0,0 +1,19 @@
+from django.urls import path
+
+from . import api
+
+app_name = "api"
+
+urlpatterns = [
+    path("posts/", api.posts, name="posts"),
+    path(
+        "categories/<slug:category_slug>/posts/",
+        api.category_posts,
+        name="category_posts",
+    ),
+    path(
+        "profile/<str:username>/posts/",
+        api.profile_posts,
+        name="profile_posts",
+    ),
+]
@@ -8,3 +8,6 @@ class BlogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "blog"
     verbose_name = _("Блог")  # русское название приложения для админки
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
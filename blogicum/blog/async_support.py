@@ -0,0 +1,27 @@
+"""Помощники для асинхронных представлений.
+
+В Django 3.2 у ORM нет асинхронного интерфейса: запросы к базе из
+корутины выполняются в потоках через sync_to_async. Независимые
+запросы запускаются одновременно (asyncio.gather), каждый в своём
+потоке и со своим соединением.
+"""
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def database(func):
+    """Корутина, которая выполняет `func` в отдельном потоке.
+
+    Потоки не привязаны к запросу (thread_sensitive=False), поэтому
+    несколько таких вызовов идут параллельно. Как и в конце обычного
+    запроса, соединение потока закрывается (или возвращается в пул),
+    если его срок по CONN_MAX_AGE истёк.
+    """
+
+    def call(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(call, thread_sensitive=False)
@@ -0,0 +1,138 @@
+"""Асинхронные варианты лент и страницы поста для ASGI.
+
+Под ASGI (BLOG_ASYNC_VIEWS) их подключает blog.urls вместо одноимённых
+представлений из blog.views. Страница та же, но независимые запросы
+выполняются одновременно: категория или автор вместе со страницей ленты,
+пост вместе со страницей комментариев. Пока запросы ждут базу, цикл
+событий обслуживает другие соединения.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.paginator import Page
+from django.shortcuts import get_object_or_404, render
+
+from .async_support import database
+from .comments import (
+    ThreadPaginator,
+    comments_page,
+    cursor_after,
+    page_rows,
+    per_page,
+)
+from .conditional import conditional_page
+from .feed import category_entries, entries
+from .forms import CommentForm
+from .models import Category
+from .page_cache import anonymous_page_cache
+from .views import (
+    _category_feed,
+    _detail_posts,
+    _index_feed,
+    _profile_feed,
+    get_visible_post,
+    paginate_queryset,
+)
+
+
+def _profile_page(request, username):
+    # request.user читает сессию из базы, поэтому тоже здесь, в потоке.
+    return paginate_queryset(_profile_feed(request, username), request)
+
+
+def _page_number(value):
+    """Номер страницы из запроса; неверный — первая, как в get_page."""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return 1
+    return max(number, 1)
+
+
+def _first_comments(post, rows):
+    """Первая страница обсуждения из прочитанных заранее строк `rows`."""
+    return Page(rows, 1, ThreadPaginator(post, per_page()))
+
+
+def _comments(post, number):
+    """Страница обсуждения `number`; неверный номер — ближайшая страница."""
+    page = comments_page(post, number)
+    page.object_list = list(page.object_list)
+    return page
+
+
+async def _render(request, template_name, context):
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@conditional_page(feed=_index_feed, tags=["feed", "catalog"])
+@anonymous_page_cache(tags=lambda: ["feed"], feed=lambda: {})
+async def index(request):
+    page_obj = await database(paginate_queryset)(entries(), request)
+    return await _render(request, "blog/index.html", {"page_obj": page_obj})
+
+
+@conditional_page(feed=_category_feed, tags=["feed", "catalog"])
+@anonymous_page_cache(
+    tags=lambda category_slug: ["feed"],
+    feed=lambda category_slug: {"category": category_slug},
+)
+async def category_posts(request, category_slug):
+    category, page_obj = await asyncio.gather(
+        database(get_object_or_404)(
+            Category, slug=category_slug, is_published=True
+        ),
+        database(paginate_queryset)(category_entries(category_slug), request),
+    )
+    return await _render(
+        request,
+        "blog/category.html",
+        {"category": category, "page_obj": page_obj},
+    )
+
+
+@conditional_page(feed=_profile_feed, tags=["feed", "catalog"])
+async def profile(request, username):
+    profile_user, page_obj = await asyncio.gather(
+        database(get_object_or_404)(User, username=username),
+        database(_profile_page)(request, username),
+    )
+    return await _render(
+        request,
+        "blog/profile.html",
+        {"profile": profile_user, "page_obj": page_obj},
+    )
+
+
+@conditional_page(posts=_detail_posts, tags=["catalog"])
+@anonymous_page_cache(tags=lambda post_id: [f"post:{post_id}", "catalog"])
+async def post_detail(request, post_id):
+    number = _page_number(request.GET.get("comments_page"))
+    if number == 1:
+        # Первая страница есть всегда, её можно читать вместе с постом.
+        post, rows = await asyncio.gather(
+            database(get_visible_post)(request, post_id),
+            database(page_rows)(post_id, 1),
+        )
+        comments = _first_comments(post, rows)
+    else:
+        # Другой номер сначала сверяется с числом страниц поста, иначе
+        # огромный номер переполнил бы OFFSET запроса.
+        post = await database(get_visible_post)(request, post_id)
+        comments = await database(_comments)(post, number)
+    # С первой страницы остальные комментарии подгружаются по курсору.
+    comments_cursor = None
+    if comments.number == 1 and comments.has_next():
+        comments_cursor = cursor_after(comments[len(comments) - 1])
+
+    return await _render(
+        request,
+        "blog/detail.html",
+        {
+            "post": post,
+            "comments": comments,
+            "comments_cursor": comments_cursor,
+            "form": CommentForm(),
+        },
+    )
@@ -0,0 +1,75 @@
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import get_template
+
+CARD_TEMPLATE = "includes/post_card.html"
+
+# Счётчики попаданий и промахов текущего процесса.
+stats = Counter()
+
+
+def get_card_cache():
+    return caches[settings.BLOG_CARD_CACHE_ALIAS]
+
+
+def _version_key(kind, pk):
+    return f"post-card-version:{kind}:{pk}"
+
+
+def invalidate(kind, pk):
+    """Сбросить карточки, зависящие от объекта `kind` с первичным ключом `pk`.
+
+    Старые фрагменты не удаляются, а перестают находиться: в ключ карточки
+    входит версия каждого объекта, данные которого она показывает.
+    """
+    get_card_cache().set(_version_key(kind, pk), time.time_ns(), None)
+
+
+def _card_key(post, versions):
+    parts = [f"post-card:{post.pk}"]
+    parts.extend(str(version) for version in versions)
+    return ":".join(parts)
+
+
+def _dependencies(post):
+    return [
+        ("post", post.pk),
+        ("author", post.author_id),
+        ("category", post.category_id),
+        ("location", post.location_id),
+    ]
+
+
+def render_post_card(post):
+    cache = get_card_cache()
+    version_keys = [_version_key(*dep) for dep in _dependencies(post)]
+    versions = cache.get_many(version_keys)
+    missing = {k: time.time_ns() for k in version_keys if k not in versions}
+    if missing:
+        # Потерянная версия заменяется новой, чтобы не найти фрагмент,
+        # сохранённый под одной из прежних версий.
+        cache.set_many(missing, None)
+        versions.update(missing)
+    key = _card_key(post, (versions[k] for k in version_keys))
+
+    html = cache.get(key)
+    if html is not None:
+        stats["hits"] += 1
+        return html
+
+    stats["misses"] += 1
+    html = get_template(CARD_TEMPLATE).render({"post": post})
+    cache.set(key, html, settings.BLOG_CARD_CACHE_TIMEOUT)
+    return html
+
+
+def card_cache_stats():
+    total = stats["hits"] + stats["misses"]
+    return {
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_ratio": stats["hits"] / total if total else 0.0,
+    }
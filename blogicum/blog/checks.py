@@ -0,0 +1,37 @@
+"""Проверки настроек блога для manage.py check."""
+from django.conf import settings
+from django.core import checks
+
+LOCAL_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+
+def _shared_cache_aliases():
+    return [
+        "default",
+        settings.BLOG_CARD_CACHE_ALIAS,
+        settings.BLOG_PAGE_CACHE_ALIAS,
+    ]
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """Кеши блога без отладки должны быть общими для всех процессов.
+
+    В них лежат версии тегов страничного кеша, из которых строятся ETag
+    лент: с кешем в памяти процесса воркер, не принявший правку,
+    продолжал бы отвечать 304 Not Modified со старой страницей.
+    """
+    if settings.DEBUG:
+        return []
+    return [
+        checks.Warning(
+            f"Кеш «{alias}» хранится в памяти процесса.",
+            hint=(
+                "Задайте BLOGICUM_CACHE=file или redis, чтобы все воркеры "
+                "видели одни и те же версии тегов и карточек."
+            ),
+            id="blog.W001",
+        )
+        for alias in _shared_cache_aliases()
+        if settings.CACHES[alias]["BACKEND"] == LOCAL_CACHE_BACKEND
+    ]
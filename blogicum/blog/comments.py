@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .models import Comment
+from .pagination import encode_key
+
+# Всё, что нужно includes/comments.html: текст, дата и имя автора.
+COMMENT_FIELDS = (
+    "id",
+    "post_id",
+    "text",
+    "created_at",
+    "author__id",
+    "author__username",
+)
+
+
+def thread(post_id):
+    """Комментарии к посту в порядке обсуждения, вместе с авторами."""
+    return (
+        Comment.objects.filter(post_id=post_id)
+        .select_related("author")
+        .only(*COMMENT_FIELDS)
+        .order_by("created_at", "id")
+    )
+
+
+class ThreadPaginator(Paginator):
+    """Paginator, который берёт число комментариев из Post.comment_count.
+
+    Счётчик поддерживают сигналы, поэтому COUNT(*) по обсуждению не нужен.
+    """
+
+    def __init__(self, post, per_page):
+        super().__init__(thread(post.pk), per_page)
+        self.post = post
+
+    @cached_property
+    def count(self):
+        return self.post.comment_count
+
+
+def per_page():
+    return settings.BLOG_COMMENTS_PER_PAGE
+
+
+def comments_page(post, number):
+    """Страница обсуждения `number`; неверный номер — ближайшая страница."""
+    return ThreadPaginator(post, per_page()).get_page(number)
+
+
+def page_rows(post_id, number):
+    """Комментарии страницы `number`, не проверяя, есть ли она.
+
+    Позволяет читать страницу обсуждения одновременно с самим постом,
+    до того как станет известно число страниц. Поэтому номер должен
+    быть заведомо допустимым: слишком большой переполняет OFFSET.
+    """
+    stop = number * per_page()
+    return list(thread(post_id)[stop - per_page():stop])
+
+
+def page_with(comment):
+    """Страница обсуждения, на которой находится `comment`."""
+    earlier = Comment.objects.filter(post_id=comment.post_id).filter(
+        Q(created_at__lt=comment.created_at)
+        | Q(created_at=comment.created_at, id__lt=comment.id)
+    )
+    return comments_page(comment.post, earlier.count() // per_page() + 1)
+
+
+def cursor_after(comment):
+    return encode_key(comment.created_at, comment.id)
+
+
+def comments_after(post_id, after, limit):
+    """Следующие `limit` комментариев после ключа `after`.
+
+    `after` — пара (created_at, id) последнего показанного комментария
+    или None для начала обсуждения. Возвращает (комментарии, курсор
+    следующей порции или None).
+    """
+    comments = thread(post_id)
+    if after is not None:
+        created_at, comment_id = after
+        comments = comments.filter(
+            Q(created_at__gt=created_at)
+            | Q(created_at=created_at, id__gt=comment_id)
+        )
+    rows = list(comments[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, cursor_after(rows[-1]) if has_more else None
@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import page_cache
+from .async_support import database
+
+
+def _page_state(posts, feed):
+    """Состояние данных страницы: (части ETag, моменты изменений).
+
+    Для страницы поста это агрегат по её постам: правка поста и любое
+    изменение его комментариев сдвигают Post.updated_at. Для ленты —
+    первая запись её диапазона в FeedEntry (один шаг по индексу):
+    остальные изменения ленты сбрасывают теги, а наступление отложенной
+    публикации делает опубликованный пост первым в ленте.
+    """
+    if feed is not None:
+        head = feed.values_list("pub_date", "id").first()
+        return head, [head[0]] if head else []
+    state = posts.aggregate(
+        last_updated=Max("updated_at"),
+        last_published=Max("pub_date"),
+        total=Count("pk"),
+    )
+    return (
+        (state["last_updated"], state["last_published"], state["total"]),
+        [state["last_updated"], state["last_published"]],
+    )
+
+
+def _validators(request, tags, posts=None, feed=None):
+    """Вычислить (ETag, Last-Modified) одним коротким запросом.
+
+    Переименование категорий, мест и авторов и правки в лентах меняют
+    версии тегов страничного кеша. Поэтому кеш с версиями должен быть
+    общим для всех процессов (проверка blog.W001).
+    """
+    state, moments = _page_state(posts, feed)
+    changed_at = page_cache.tags_changed_at(tags)
+    last_modified = max(
+        moment for moment in (*moments, changed_at) if moment is not None
+    )
+    fingerprint = "|".join(
+        str(part)
+        for part in (
+            request.get_full_path(),
+            request.user.pk,
+            state,
+            changed_at.timestamp(),
+        )
+    )
+    etag = hashlib.md5(fingerprint.encode()).hexdigest()
+    return etag, last_modified
+
+
+def _not_modified(request, etag, last_modified):
+    """Ответ 304 или 412, если клиенту не нужна страница, иначе None."""
+    return get_conditional_response(
+        request,
+        etag=quote_etag(etag),
+        last_modified=timegm(last_modified.utctimetuple()),
+    )
+
+
+def _with_validators(request, response, etag, last_modified):
+    # Как у django.views.decorators.http.condition.
+    if request.method in ("GET", "HEAD"):
+        if not response.has_header("Last-Modified"):
+            response["Last-Modified"] = http_date(
+                timegm(last_modified.utctimetuple())
+            )
+        response.headers.setdefault("ETag", quote_etag(etag))
+    return response
+
+
+def conditional_page(tags, posts=None, feed=None):
+    """Отвечать 304 Not Modified, не выполняя представление.
+
+    `posts(request, *args, **kwargs)` возвращает QuerySet постов, из
+    которых строится страница, а для лент `feed` — записи ленты
+    (blog.feed.entries); `tags` — теги страничного кеша, изменение
+    которых тоже меняет страницу. Подходит и для async def: тогда в
+    потоке вычисляются только ETag и Last-Modified.
+    """
+
+    def check(request, args, kwargs):
+        """Вернуть (ETag, Last-Modified, готовый ответ или None)."""
+        etag, last_modified = _validators(
+            request,
+            tags,
+            posts=posts and posts(request, *args, **kwargs),
+            feed=feed and feed(request, *args, **kwargs),
+        )
+        return (
+            etag,
+            last_modified,
+            _not_modified(request, etag, last_modified),
+        )
+
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                etag, last_modified, response = await database(check)(
+                    request, args, kwargs
+                )
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _with_validators(request, response, etag, last_modified)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            etag, last_modified, response = check(request, args, kwargs)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return _with_validators(request, response, etag, last_modified)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,143 @@
+"""Подсчёт строк для постраничного вывода без точного COUNT(*).
+
+До BLOG_EXACT_COUNT_LIMIT строк число считается точно. Дальше точность
+не нужна, и используется оценка:
+
+- для таблицы целиком — pg_class.reltuples на PostgreSQL и счётчик
+  TableSize, который поддерживают триггеры, на SQLite;
+- для выборки со счётчиком в count_hint (видимые записи общей ленты) —
+  этот счётчик TableSize на SQLite;
+- для остальных выборок с фильтрами — оценка планировщика (EXPLAIN) на
+  PostgreSQL и закешированный результат COUNT(*) на SQLite.
+
+count() возвращает пару (число, точное ли оно): выше
+BLOG_EXACT_COUNT_LIMIT число всегда считается оценкой, даже если его
+только что посчитал COUNT(*).
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import connections
+
+from . import page_cache
+from .models import TableSize
+
+
+def stored_size(name, using="default"):
+    """Значение счётчика TableSize `name` или None, если его нет."""
+    return (
+        TableSize.objects.using(using)
+        .filter(table=name)
+        .values_list("rows", flat=True)
+        .first()
+    )
+
+
+def table_size(model, using="default"):
+    """Оценка числа строк таблицы `model` или None, если её нет."""
+    table = model._meta.db_table
+    if connections[using].vendor != "postgresql":
+        return stored_size(table, using)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = %s::regclass",
+            [table],
+        )
+        row = cursor.fetchone()
+    # -1 — таблицу ещё ни разу не анализировали.
+    return row[0] if row and row[0] >= 0 else None
+
+
+def planner_estimate(queryset):
+    """Сколько строк вернёт `queryset` по мнению планировщика PostgreSQL."""
+    connection = connections[queryset.db]
+    sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _is_whole_table(queryset):
+    query = queryset.query
+    return not (
+        query.where
+        or query.is_sliced
+        or query.distinct
+        or query.combinator
+        or query.group_by
+    )
+
+
+def count_hint(queryset, key=None, counter=None):
+    """Подсказать count(), как считать строки `queryset`.
+
+    `key` — та же выборка без условий, которые меняются от запроса к
+    запросу (например, «сейчас» в фильтре ленты): закешированное на
+    SQLite число ищется по её SQL. `counter` — счётчик TableSize с
+    числом строк выборки. Подсказка переходит к копиям выборки, но не к
+    выборке с новыми фильтрами: её число строк уже другое.
+    """
+    queryset.query.count_hint = (
+        len(queryset.query.where.children),
+        key,
+        counter,
+    )
+    return queryset
+
+
+def _hint(queryset):
+    query = queryset.query
+    conditions, key, counter = getattr(query, "count_hint", (None, None, None))
+    if query.is_sliced or len(query.where.children) != conditions:
+        return None, None
+    return key, counter
+
+
+def _cache_key(queryset, tags):
+    sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    digest = hashlib.md5(
+        json.dumps([queryset.db, sql, params], default=str).encode()
+    ).hexdigest()
+    versions = ":".join(str(v) for v in page_cache.tag_versions(tags))
+    return f"row-count:{digest}:{versions}"
+
+
+def _estimated(size, queryset):
+    limit = settings.BLOG_EXACT_COUNT_LIMIT
+    if size is not None and size > limit:
+        return size, False
+    return queryset.count(), True
+
+
+def count(queryset, tags=()):
+    """Число строк `queryset` и признак, точное ли оно.
+
+    `tags` — теги page_cache, при сбросе которых закешированное на SQLite
+    число устаревает; в любом случае оно живёт не дольше
+    BLOG_COUNT_CACHE_TIMEOUT.
+    """
+    if _is_whole_table(queryset):
+        return _estimated(table_size(queryset.model, queryset.db), queryset)
+    if connections[queryset.db].vendor == "postgresql":
+        return _estimated(planner_estimate(queryset), queryset)
+    key, name = _hint(queryset)
+    if name is not None:
+        return _estimated(stored_size(name, queryset.db), queryset)
+
+    cache = page_cache.get_page_cache()
+    key = _cache_key(queryset if key is None else key, tags)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, False
+    # Один COUNT(*): до предела он не дороже запроса с LIMIT, а большое
+    # число кешируется.
+    total = queryset.count()
+    if total <= settings.BLOG_EXACT_COUNT_LIMIT:
+        return total, True
+    cache.set(key, total, settings.BLOG_COUNT_CACHE_TIMEOUT)
+    return total, False
@@ -0,0 +1,28 @@
+"""Настройка соединений с SQLite.
+
+PRAGMA из BLOG_SQLITE_PRAGMAS выполняются для каждого нового соединения
+(сигнал connection_created, см. blog.signals). Большинство из них
+действуют только на текущее соединение, journal_mode=WAL сохраняется в
+файле базы.
+"""
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+
+PRAGMA_RE = re.compile(r"^[a-z_]+$")
+VALUE_RE = re.compile(r"^-?\w+$")
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    """Выполнить `pragmas` ({имя: значение}) на соединении DB-API."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if not PRAGMA_RE.match(name) or not VALUE_RE.match(str(value)):
+                raise ImproperlyConfigured(
+                    "Недопустимая PRAGMA в BLOG_SQLITE_PRAGMAS: "
+                    f"{name}={value}"
+                )
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
@@ -0,0 +1,182 @@
+"""Материализованная лента (FeedEntry).
+
+Для каждого поста хранится строка с его категорией, автором, датой
+публикации и флагами видимости. Страница ленты — диапазон по индексу
+этой таблицы (общему, категории или автора), без соединений и фильтров
+по связанным таблицам; посты страницы затем загружаются по id.
+
+Записи обновляют сигналы сохранения и удаления постов и категорий.
+Отложенная публикация обновлять не нужно: в записи есть pub_date, и пост
+попадает в диапазон pub_date <= now(), когда наступает его время.
+Изменения в обход сигналов (bulk_create, QuerySet.update) исправляет
+команда rebuild_feed.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import counting
+from .models import Category, FeedEntry, Post
+from .pagination import paginate_feed
+
+BATCH_SIZE = 500
+# Счётчик TableSize видимых записей ленты (миграция 0017). Отложенные
+# посты в нём тоже учтены, поэтому для общей ленты это оценка сверху.
+LISTED_COUNTER = "blog_feedentry:listed"
+# Колонки записи — в таблице FeedEntry и в выборке из постов.
+COLUMNS = (
+    "id",
+    "category_id",
+    "author_id",
+    "pub_date",
+    "is_published",
+    "category_is_published",
+)
+# Поля поста, от которых зависит его запись в ленте.
+SOURCE_FIELDS = {"category", "author", "pub_date", "is_published"}
+
+
+def _source(posts):
+    """Записи ленты для `posts`, вычисленные заново, — кортежи COLUMNS."""
+    # Пост без категории не показывается, как и пост скрытой категории.
+    return posts.annotate(
+        category_is_published=Coalesce("category__is_published", Value(False))
+    ).values_list(*COLUMNS)
+
+
+def _entry(row):
+    return FeedEntry(**dict(zip(COLUMNS, row)))
+
+
+def refresh(post_ids):
+    """Пересобрать записи постов `post_ids`; у удалённых — удалить."""
+    post_ids = list(post_ids)
+    for start in range(0, len(post_ids), BATCH_SIZE):
+        stop = start + BATCH_SIZE
+        batch = post_ids[start:stop]
+        posts = Post.objects.filter(pk__in=batch)
+        with transaction.atomic():
+            fresh = [_entry(row) for row in _source(posts)]
+            FeedEntry.objects.filter(pk__in=batch).delete()
+            FeedEntry.objects.bulk_create(fresh)
+
+
+def forget(post_id):
+    FeedEntry.objects.filter(pk=post_id).delete()
+
+
+def category_changed(category):
+    FeedEntry.objects.filter(category_id=category.pk).update(
+        category_is_published=category.is_published
+    )
+
+
+def category_deleted(category_id):
+    # Посты удалённой категории остаются без неё (SET_NULL).
+    FeedEntry.objects.filter(category_id=category_id).update(
+        category_id=None, category_is_published=False
+    )
+
+
+def rebuild():
+    """Заполнить ленту заново по всем постам; вернуть число записей."""
+    total = 0
+    with transaction.atomic():
+        FeedEntry.objects.all().delete()
+        batch = []
+        rows = _source(Post.objects.order_by()).iterator(BATCH_SIZE)
+        for row in rows:
+            batch.append(_entry(row))
+            if len(batch) == BATCH_SIZE:
+                FeedEntry.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        FeedEntry.objects.bulk_create(batch)
+    return total + len(batch)
+
+
+def drift():
+    """Номера постов, чьи записи расходятся с постами.
+
+    Это посты без записи, записи удалённых постов и записи, в которых
+    категория, автор, дата или флаги видимости устарели.
+    """
+    expected = {
+        row[0]: row
+        for row in _source(Post.objects.order_by()).iterator(BATCH_SIZE)
+    }
+    drifted = []
+    stored = FeedEntry.objects.order_by().values_list(*COLUMNS)
+    for row in stored.iterator(BATCH_SIZE):
+        if expected.pop(row[0], None) != row:
+            drifted.append(row[0])
+    drifted.extend(expected)
+    return sorted(drifted)
+
+
+def entries(published=True, **filters):
+    """Записи ленты в порядке (-pub_date, -id).
+
+    `filters` — category_id или author_id; published=False оставляет и
+    скрытые посты (автор в своём профиле видит все).
+    """
+    queryset = (
+        FeedEntry.objects.filter(**filters)
+        .only("id", "pub_date")
+        .order_by("-pub_date", "-id")
+    )
+    if not published:
+        return queryset
+    visible = queryset.filter(is_published=True, category_is_published=True)
+    return counting.count_hint(
+        visible.filter(pub_date__lte=timezone.now()),
+        # «Сейчас» меняется с каждым запросом, поэтому число строк
+        # кешируется по выборке без него.
+        key=visible,
+        counter=None if filters else LISTED_COUNTER,
+    )
+
+
+def category_entries(category_slug):
+    """Лента категории по слагу — одним запросом, без чтения категории."""
+    return entries(
+        category_id=Subquery(
+            Category.objects.filter(slug=category_slug).values("id")
+        )
+    )
+
+
+def author_entries(username, published=True):
+    """Лента автора по имени — одним запросом, без чтения автора."""
+    return entries(
+        published,
+        author_id=Subquery(
+            get_user_model().objects.filter(username=username).values("id")
+        ),
+    )
+
+
+def page_posts(entries, posts=None):
+    """Запрос постов среза записей `entries` в том же порядке.
+
+    Срез становится подзапросом: диапазон по индексу ленты и посты по id
+    читаются одним запросом. `posts` — выборка постов (по умолчанию
+    Post.objects.feed()), например values_list для API.
+    """
+    if posts is None:
+        posts = Post.objects.feed()
+    return posts.filter(pk__in=entries.values("id")).order_by(
+        *entries.query.order_by
+    )
+
+
+def posts_for(entries, posts=None):
+    """Посты среза записей `entries` списком — для постраничного вывода."""
+    return list(page_posts(entries, posts))
+
+
+def paginate(queryset, request, per_page):
+    """Страница ленты: записи `queryset`, заменённые их постами."""
+    return paginate_feed(queryset, request, per_page, load=posts_for)
@@ -14,6 +14,19 @@ class CommentForm(forms.ModelForm):
 
 
 class PostForm(forms.ModelForm):
+    def __init__(self, *args, upload_errors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Ошибки файлов, отклонённых ещё при приёме запроса
+        # (см. blog.uploads.StreamingImageUploadHandler).
+        self.upload_errors = upload_errors or {}
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for field, message in self.upload_errors.items():
+            if field in self.fields:
+                self.add_error(field, message)
+        return cleaned_data
+
     class Meta:
         model = Post
         fields = [
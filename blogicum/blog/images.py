@@ -0,0 +1,108 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .models import Post
+
+VARIANT_WIDTHS = (320, 640, 1280)
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+VARIANTS_DIR = "variants"
+
+
+def image_storage():
+    return Post._meta.get_field("image").storage
+
+
+def _encode(image, fmt):
+    buffer = BytesIO()
+    if fmt == "jpeg":
+        image.convert("RGB").save(
+            buffer, "JPEG", quality=JPEG_QUALITY, optimize=True
+        )
+    elif fmt == "webp":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def strip_metadata(name):
+    """Пересохранить оригинал без EXIF и прочих метаданных.
+
+    Ориентация из EXIF применяется к пикселям, чтобы снимок не
+    «лёг на бок». Возвращает имя нового файла; старый остаётся на месте,
+    пока пост на него ссылается.
+    """
+    storage = image_storage()
+    with storage.open(name) as fh, Image.open(fh) as source:
+        fmt = "png" if source.format == "PNG" else "jpeg"
+        image = ImageOps.exif_transpose(source)
+        content = _encode(image, fmt)
+    original = PurePosixPath(name)
+    extension = "png" if fmt == "png" else "jpg"
+    new_name = storage.save(
+        str(original.parent / f"{original.stem}.{extension}"),
+        ContentFile(content),
+    )
+    return new_name
+
+
+def build_variants(name):
+    """Создать уменьшенные копии и WebP-версии изображения `name`.
+
+    Возвращает описание для Post.image_variants: размеры оригинала и
+    списки (ширина, имя файла) для каждого формата.
+    """
+    storage = image_storage()
+    original = PurePosixPath(name)
+    folder = original.parent / VARIANTS_DIR
+
+    with storage.open(name) as fh, Image.open(fh) as source:
+        fmt = "png" if source.format == "PNG" else "jpeg"
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if fmt == "png" else "RGB")
+        width, height = image.size
+
+        sources = {fmt: [], "webp": []}
+        widths = [w for w in VARIANT_WIDTHS if w < width] + [width]
+        for variant_width in widths:
+            if variant_width == width:
+                resized = image
+            else:
+                variant_height = round(height * variant_width / width)
+                resized = image.resize(
+                    (variant_width, variant_height), Image.LANCZOS
+                )
+            for variant_fmt in sources:
+                if variant_fmt == fmt and variant_width == width:
+                    # Оригинал уже лежит в хранилище.
+                    continue
+                target = f"{original.stem}_{variant_width}.{variant_fmt}"
+                variant_name = storage.save(
+                    str(folder / target),
+                    ContentFile(_encode(resized, variant_fmt)),
+                )
+                sources[variant_fmt].append([variant_width, variant_name])
+
+    return {"width": width, "height": height, "sources": sources}
+
+
+def variant_names(variants):
+    return [
+        name
+        for entries in variants.get("sources", {}).values()
+        for _, name in entries
+    ]
+
+
+def process_image(name):
+    """Полная обработка загруженного изображения для фонового обработчика.
+
+    Выполняется в дочернем процессе и не обращается к базе данных.
+    """
+    clean_name = strip_metadata(name)
+    return {"image": clean_name, "variants": build_variants(clean_name)}
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .media import delete_unreferenced, referenced_names
+from .models import ImageJob, ImageStatus, Post
+
+MAX_ATTEMPTS = 3
+# Задача, которая обрабатывается дольше, считается брошенной упавшим
+# обработчиком и возвращается в очередь.
+STALE_AFTER = timedelta(minutes=10)
+
+
+def schedule_image_processing(post):
+    """Поставить изображение поста в очередь обработки.
+
+    Вызывается после сохранения формы. Варианты прежнего изображения
+    снимаются сразу: пока задача ждёт очереди, страница показывает новое
+    изображение без srcset, а не старые варианты.
+    """
+    post.image_variants = {}
+    if not post.image:
+        post.image_status = ImageStatus.READY
+        post.save(update_fields=["image_variants", "image_status"])
+        return None
+
+    with transaction.atomic():
+        # Более ранние задачи для этого поста устарели.
+        post.image_jobs.filter(status=ImageStatus.PENDING).delete()
+        job = ImageJob.objects.create(post=post, image=post.image.name)
+        post.image_status = ImageStatus.PENDING
+        post.save(update_fields=["image_variants", "image_status"])
+    return job
+
+
+def claim_jobs(limit):
+    """Забрать до `limit` задач из очереди.
+
+    Задача достаётся тому обработчику, чей UPDATE перевёл её из
+    PENDING в PROCESSING, поэтому несколько обработчиков не возьмут
+    одну задачу дважды ни на SQLite, ни на PostgreSQL.
+    """
+    claimed = []
+    candidates = ImageJob.objects.filter(
+        status=ImageStatus.PENDING
+    ).values_list("pk", flat=True)[: limit * 2]
+    for pk in candidates:
+        taken = ImageJob.objects.filter(
+            pk=pk, status=ImageStatus.PENDING
+        ).update(
+            status=ImageStatus.PROCESSING,
+            started_at=timezone.now(),
+            attempts=F("attempts") + 1,
+        )
+        if taken:
+            claimed.append(ImageJob.objects.get(pk=pk))
+            if len(claimed) == limit:
+                break
+    Post.objects.filter(pk__in=[job.post_id for job in claimed]).update(
+        image_status=ImageStatus.PROCESSING
+    )
+    return claimed
+
+
+def complete_job(job, result):
+    post = Post.objects.filter(pk=job.post_id).first()
+    if post is None or post.image.name != job.image:
+        # Пока шла обработка, пост удалили или заменили изображение.
+        delete_unreferenced(
+            referenced_names(result["image"], result["variants"])
+        )
+        ImageJob.objects.filter(pk=job.pk).update(
+            status=ImageStatus.READY, finished_at=timezone.now()
+        )
+        return
+
+    # Ссылки на исходный файл и прежние варианты снимают сигналы Post.
+    with transaction.atomic():
+        job.status = ImageStatus.READY
+        job.finished_at = timezone.now()
+        job.error = ""
+        job.save(update_fields=["status", "finished_at", "error"])
+        post.image.name = result["image"]
+        post.image_variants = result["variants"]
+        post.image_status = ImageStatus.READY
+        post.save(update_fields=["image", "image_variants", "image_status"])
+
+
+def fail_job(job, error):
+    retry = job.attempts < MAX_ATTEMPTS
+    job.status = ImageStatus.PENDING if retry else ImageStatus.FAILED
+    job.error = str(error)
+    job.finished_at = None if retry else timezone.now()
+    job.save(update_fields=["status", "error", "finished_at"])
+    if not retry:
+        Post.objects.filter(pk=job.post_id, image=job.image).update(
+            image_status=ImageStatus.FAILED
+        )
+
+
+def requeue_stale_jobs():
+    return ImageJob.objects.filter(
+        status=ImageStatus.PROCESSING,
+        started_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status=ImageStatus.PENDING)
@@ -0,0 +1,70 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.images import image_storage
+from blog.models import MediaFile
+
+UPLOAD_ROOT = "posts"
+
+
+def stored_files(storage, directory):
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for subdirectory in directories:
+        yield from stored_files(
+            storage, posixpath.join(directory, subdirectory)
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет изображения, на которые не ссылается ни один пост: "
+        "например, оставшиеся после сбоя обработчика."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=60 * 60,
+            help=(
+                "Не трогать файлы моложе стольких секунд: их, возможно, "
+                "ещё обрабатывают."
+            ),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать файлы без ссылок, не удаляя их.",
+        )
+
+    def handle(self, *args, **options):
+        storage = image_storage()
+        if not storage.exists(UPLOAD_ROOT):
+            self.stdout.write("Каталог изображений пуст.")
+            return
+
+        referenced = set(
+            MediaFile.objects.filter(refs__gt=0).values_list("name", flat=True)
+        )
+        threshold = timezone.now() - timedelta(seconds=options["min_age"])
+        orphans = [
+            name
+            for name in stored_files(storage, UPLOAD_ROOT)
+            if name not in referenced
+            and storage.get_modified_time(name) < threshold
+        ]
+        for name in orphans:
+            if options["verbosity"] > 1:
+                self.stdout.write(name)
+            if not options["dry_run"]:
+                storage.delete(name)
+
+        verb = "Найдено" if options["dry_run"] else "Удалено"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} файлов без ссылок: {len(orphans)}")
+        )
@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.images import build_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Создаёт уменьшенные копии и WebP-версии изображений постов."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Число процессов для обработки изображений.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Пересоздать варианты и для уже обработанных постов.",
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image="").exclude(image__isnull=True)
+        if not options["force"]:
+            posts = posts.filter(image_variants={})
+        pending = dict(posts.values_list("pk", "image"))
+        if not pending:
+            self.stdout.write("Все изображения уже обработаны.")
+            return
+
+        # Дочерние процессы не должны наследовать открытые соединения.
+        connections.close_all()
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            futures = {
+                pool.submit(build_variants, name): pk
+                for pk, name in pending.items()
+            }
+            for future in as_completed(futures):
+                pk = futures[future]
+                try:
+                    variants = future.result()
+                except Exception as error:
+                    failed += 1
+                    self.stderr.write(f"Пост {pk}: {error}")
+                    continue
+                post = Post.objects.get(pk=pk)
+                post.image_variants = variants
+                post.save(update_fields=["image_variants"])
+                done += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Обработано изображений: {done}, с ошибками: {failed}"
+            )
+        )
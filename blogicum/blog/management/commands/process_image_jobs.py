@@ -0,0 +1,61 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blog.images import process_image
+from blog.jobs import claim_jobs, complete_job, fail_job, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Фоновый обработчик изображений: берёт задачи из очереди в базе "
+        "данных и обрабатывает их в пуле процессов."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Число процессов для обработки изображений.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Пауза в секундах, когда очередь пуста.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Обработать текущую очередь и завершиться.",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        # Дочерние процессы не должны наследовать открытые соединения.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                requeue_stale_jobs()
+                jobs = claim_jobs(limit=workers)
+                if not jobs:
+                    if options["once"]:
+                        return
+                    time.sleep(options["poll_interval"])
+                    continue
+                futures = {
+                    pool.submit(process_image, job.image): job for job in jobs
+                }
+                wait(futures)
+                for future, job in futures.items():
+                    error = future.exception()
+                    if error is None:
+                        complete_job(job, future.result())
+                        self.stdout.write(f"Готово: {job}")
+                    else:
+                        fail_job(job, error)
+                        self.stderr.write(f"Ошибка: {job}: {error}")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from blog import feed, page_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Сверяет материализованную ленту (FeedEntry) с постами и "
+        "исправляет расхождения."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать расхождения, не исправляя их.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Не сверять, а заполнить ленту заново по всем постам.",
+        )
+
+    def handle(self, *args, **options):
+        if options["full"] and not options["dry_run"]:
+            total = feed.rebuild()
+            page_cache.invalidate_tags("feed")
+            self.stdout.write(self.style.SUCCESS(f"Записей в ленте: {total}"))
+            return
+
+        drifted = feed.drift()
+        if options["verbosity"] > 1:
+            for post_id in drifted:
+                self.stdout.write(f"Пост {post_id}")
+        if not options["dry_run"] and drifted:
+            feed.refresh(drifted)
+            page_cache.invalidate_tags("feed")
+
+        verb = "Найдено" if options["dry_run"] else "Исправлено"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} расхождений: {len(drifted)}")
+        )
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog import card_cache
+from blog.models import Comment, Post
+
+BATCH_SIZE = 500
+
+
+def actual_comment_count():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = "Сверяет Post.comment_count с фактическим числом комментариев."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать расхождения, не исправляя их.",
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            Post.objects.annotate(actual=actual_comment_count())
+            .exclude(comment_count=F("actual"))
+            .values_list("pk", "comment_count", "actual")
+        )
+        drifted_ids = []
+        for post_id, stored, actual in drifted.iterator():
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Пост {post_id}: {stored} -> {actual}")
+            drifted_ids.append(post_id)
+
+        if not options["dry_run"]:
+            for start in range(0, len(drifted_ids), BATCH_SIZE):
+                Post.objects.filter(
+                    pk__in=drifted_ids[start:start + BATCH_SIZE]
+                ).update(comment_count=actual_comment_count())
+            for post_id in drifted_ids:
+                card_cache.invalidate("post", post_id)
+
+        verb = "Найдено" if options["dry_run"] else "Исправлено"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} расхождений: {len(drifted_ids)}")
+        )
@@ -0,0 +1,58 @@
+"""Учёт ссылок на файлы изображений постов.
+
+Хранилище blog.storage.ContentAddressedStorage кладёт одинаковые файлы
+по одному адресу, поэтому удалить файл вместе с постом нельзя: его может
+использовать другой пост. Сигналы Post ведут счётчики MediaFile, и файл
+удаляется, когда на него не остаётся ссылок.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from .images import image_storage, variant_names
+from .models import MediaFile
+
+
+def referenced_names(image_name, variants):
+    """Все файлы, на которые ссылается пост: оригинал и его варианты."""
+    if not image_name:
+        return set()
+    return {image_name, *variant_names(variants or {})}
+
+
+def acquire(names):
+    for name in names:
+        MediaFile.objects.get_or_create(name=name)
+        MediaFile.objects.filter(name=name).update(refs=F("refs") + 1)
+
+
+def release(names):
+    """Снять по одной ссылке с `names` и удалить файлы без ссылок.
+
+    Файлы удаляются после фиксации транзакции, чтобы откат не оставил
+    посты без изображений.
+    """
+    names = list(names)
+    if not names:
+        return
+    MediaFile.objects.filter(name__in=names, refs__gt=0).update(
+        refs=F("refs") - 1
+    )
+    MediaFile.objects.filter(name__in=names, refs=0).delete()
+    transaction.on_commit(lambda: delete_unreferenced(names))
+
+
+def delete_unreferenced(names):
+    """Удалить из хранилища те из `names`, на которые никто не ссылается.
+
+    Подходит и для файлов, которые ещё не учтены: например, результатов
+    обработки, оказавшихся ненужными.
+    """
+    names = set(names)
+    referenced = set(
+        MediaFile.objects.filter(name__in=names, refs__gt=0).values_list(
+            "name", flat=True
+        )
+    )
+    storage = image_storage()
+    for name in names - referenced:
+        storage.delete(name)
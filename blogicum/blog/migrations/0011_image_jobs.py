@@ -0,0 +1,109 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_post_image_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_status",
+            field=models.CharField(
+                choices=[
+                    ("ready", "Готово"),
+                    ("pending", "В очереди"),
+                    ("processing", "Обрабатывается"),
+                    ("failed", "Ошибка"),
+                ],
+                default="ready",
+                editable=False,
+                max_length=16,
+                verbose_name="Обработка изображения",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ImageJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "image",
+                    models.CharField(
+                        max_length=255, verbose_name="Исходный файл"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("ready", "Готово"),
+                            ("pending", "В очереди"),
+                            ("processing", "Обрабатывается"),
+                            ("failed", "Ошибка"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Попыток"
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Ошибка")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Добавлено"
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Начато"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Завершено"
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="image_jobs",
+                        to="blog.post",
+                        verbose_name="Публикация",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "обработка изображения",
+                "verbose_name_plural": "Обработка изображений",
+                "ordering": ("id",),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="imagejob",
+            index=models.Index(
+                fields=["status", "id"], name="imagejob_status_idx"
+            ),
+        ),
+    ]
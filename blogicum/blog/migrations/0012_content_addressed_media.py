@@ -0,0 +1,78 @@
+# Generated by Django 3.2.16 on 2026-10-18 03:48
+
+from collections import Counter
+
+import blog.storage
+from django.db import migrations, models
+
+
+def count_references(apps, schema_editor):
+    # Файлы, загруженные до перехода на новое хранилище, сохраняют свои
+    # имена, но тоже получают счётчики ссылок.
+    Post = apps.get_model("blog", "Post")
+    MediaFile = apps.get_model("blog", "MediaFile")
+    refs = Counter()
+    for image, variants in Post.objects.exclude(image="").values_list(
+        "image", "image_variants"
+    ):
+        if not image:
+            continue
+        refs[image] += 1
+        for entries in (variants or {}).get("sources", {}).values():
+            refs.update(name for _, name in entries)
+    MediaFile.objects.bulk_create(
+        [MediaFile(name=name, refs=count) for name, count in refs.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_image_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Имя файла"
+                    ),
+                ),
+                (
+                    "refs",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Ссылок"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "файл",
+                "verbose_name_plural": "Файлы",
+            },
+        ),
+        migrations.AlterField(
+            model_name="post",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=blog.storage.post_image_storage,
+                upload_to="posts/",
+                verbose_name="Изображение",
+            ),
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+from django.db import migrations
+
+SQLITE_FORWARD = (
+    """
+    CREATE VIRTUAL TABLE blog_post_fts USING fts5(
+        title, text,
+        content='blog_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN
+        INSERT INTO blog_post_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN
+        INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    # Индекс трогается, только если поменялся текст поста: смена счётчика
+    # комментариев или картинки его не касается.
+    """
+    CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text
+    ON blog_post BEGIN
+        INSERT INTO blog_post_fts(blog_post_fts, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO blog_post_fts(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = (
+    "DROP TRIGGER IF EXISTS blog_post_fts_update",
+    "DROP TRIGGER IF EXISTS blog_post_fts_delete",
+    "DROP TRIGGER IF EXISTS blog_post_fts_insert",
+    "DROP TABLE IF EXISTS blog_post_fts",
+)
+POSTGRESQL_FORWARD = (
+    """
+    CREATE INDEX blog_post_search_idx ON blog_post USING GIN ((
+        setweight(to_tsvector('russian', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(text, '')), 'B')
+    ))
+    """,
+)
+POSTGRESQL_BACKWARD = ("DROP INDEX IF EXISTS blog_post_search_idx",)
+
+
+def _run(schema_editor, statements):
+    for sql in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    _run(
+        schema_editor,
+        {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRESQL_FORWARD},
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    _run(
+        schema_editor,
+        {"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRESQL_BACKWARD},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_content_addressed_media"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:04
+
+from django.db import migrations, models
+
+# Таблицы, размер которых поддерживается в blog_tablesize на SQLite.
+COUNTED_TABLES = ("blog_post", "blog_comment")
+
+
+def create_counters(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table in COUNTED_TABLES:
+        schema_editor.execute(
+            f'INSERT INTO blog_tablesize ("table", rows) '
+            f"SELECT '{table}', COUNT(*) FROM {table}"
+        )
+        schema_editor.execute(f"""
+            CREATE TRIGGER {table}_size_insert AFTER INSERT ON {table}
+            BEGIN
+                UPDATE blog_tablesize SET rows = rows + 1
+                WHERE "table" = '{table}';
+            END
+            """)
+        schema_editor.execute(f"""
+            CREATE TRIGGER {table}_size_delete AFTER DELETE ON {table}
+            BEGIN
+                UPDATE blog_tablesize SET rows = rows - 1
+                WHERE "table" = '{table}';
+            END
+            """)
+
+
+def drop_counters(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table in COUNTED_TABLES:
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_size_insert")
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {table}_size_delete")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0013_post_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableSize",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "table",
+                    models.CharField(
+                        max_length=63, unique=True, verbose_name="Таблица"
+                    ),
+                ),
+                (
+                    "rows",
+                    models.BigIntegerField(default=0, verbose_name="Строк"),
+                ),
+            ],
+            options={
+                "verbose_name": "размер таблицы",
+                "verbose_name_plural": "Размеры таблиц",
+            },
+        ),
+        migrations.RunPython(create_counters, drop_counters),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:37
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    FeedEntry = apps.get_model("blog", "FeedEntry")
+    db_alias = schema_editor.connection.alias
+    rows = Post.objects.using(db_alias).annotate(
+        listed=Coalesce("category__is_published", Value(False))
+    ).values_list(
+        "id", "category_id", "author_id", "pub_date", "is_published", "listed"
+    )
+    FeedEntry.objects.using(db_alias).bulk_create(
+        [
+            FeedEntry(
+                id=post_id,
+                category_id=category_id,
+                author_id=author_id,
+                pub_date=pub_date,
+                is_published=is_published,
+                category_is_published=listed,
+            )
+            for (
+                post_id,
+                category_id,
+                author_id,
+                pub_date,
+                is_published,
+                listed,
+            ) in rows.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0014_table_sizes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Публикация",
+                    ),
+                ),
+                (
+                    "category_id",
+                    models.BigIntegerField(
+                        null=True, verbose_name="Категория"
+                    ),
+                ),
+                ("author_id", models.BigIntegerField(verbose_name="Автор")),
+                (
+                    "pub_date",
+                    models.DateTimeField(
+                        verbose_name="Дата и время публикации"
+                    ),
+                ),
+                (
+                    "is_published",
+                    models.BooleanField(verbose_name="Опубликовано"),
+                ),
+                (
+                    "category_is_published",
+                    models.BooleanField(verbose_name="Категория опубликована"),
+                ),
+            ],
+            options={
+                "verbose_name": "запись ленты",
+                "verbose_name_plural": "Записи ленты",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="feedentry",
+            index=models.Index(
+                fields=["-pub_date", "-id"], name="feed_entry_pub_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedentry",
+            index=models.Index(
+                fields=["category_id", "-pub_date", "-id"],
+                name="feed_entry_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedentry",
+            index=models.Index(
+                fields=["author_id", "-pub_date", "-id"],
+                name="feed_entry_author_idx",
+            ),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
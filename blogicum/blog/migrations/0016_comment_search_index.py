@@ -0,0 +1,77 @@
+from django.db import migrations
+
+SQLITE_FORWARD = (
+    """
+    CREATE VIRTUAL TABLE blog_comment_fts USING fts5(
+        text,
+        content='blog_comment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER blog_comment_fts_insert AFTER INSERT ON blog_comment
+    BEGIN
+        INSERT INTO blog_comment_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_comment_fts_delete AFTER DELETE ON blog_comment
+    BEGIN
+        INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_comment_fts_update AFTER UPDATE OF text
+    ON blog_comment BEGIN
+        INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO blog_comment_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    "INSERT INTO blog_comment_fts(blog_comment_fts) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = (
+    "DROP TRIGGER IF EXISTS blog_comment_fts_update",
+    "DROP TRIGGER IF EXISTS blog_comment_fts_delete",
+    "DROP TRIGGER IF EXISTS blog_comment_fts_insert",
+    "DROP TABLE IF EXISTS blog_comment_fts",
+)
+POSTGRESQL_FORWARD = (
+    """
+    CREATE INDEX blog_comment_search_idx ON blog_comment USING GIN (
+        to_tsvector('russian', coalesce(text, ''))
+    )
+    """,
+)
+POSTGRESQL_BACKWARD = ("DROP INDEX IF EXISTS blog_comment_search_idx",)
+
+
+def _run(schema_editor, statements):
+    for sql in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    _run(
+        schema_editor,
+        {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRESQL_FORWARD},
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    _run(
+        schema_editor,
+        {"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRESQL_BACKWARD},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0015_feed_entries"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:20
+
+from django.db import migrations
+
+# Счётчик видимых записей ленты в blog_tablesize (blog.feed.LISTED_COUNTER).
+COUNTER = "blog_feedentry:listed"
+LISTED = "{row}.is_published AND {row}.category_is_published"
+
+
+def create_counter(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f'INSERT INTO blog_tablesize ("table", rows) '
+        f"SELECT '{COUNTER}', COUNT(*) FROM blog_feedentry "
+        f"WHERE {LISTED.format(row='blog_feedentry')}"
+    )
+    schema_editor.execute(f"""
+        CREATE TRIGGER blog_feedentry_listed_insert
+        AFTER INSERT ON blog_feedentry
+        WHEN {LISTED.format(row='NEW')}
+        BEGIN
+            UPDATE blog_tablesize SET rows = rows + 1
+            WHERE "table" = '{COUNTER}';
+        END
+        """)
+    schema_editor.execute(f"""
+        CREATE TRIGGER blog_feedentry_listed_delete
+        AFTER DELETE ON blog_feedentry
+        WHEN {LISTED.format(row='OLD')}
+        BEGIN
+            UPDATE blog_tablesize SET rows = rows - 1
+            WHERE "table" = '{COUNTER}';
+        END
+        """)
+    schema_editor.execute(f"""
+        CREATE TRIGGER blog_feedentry_listed_update
+        AFTER UPDATE OF is_published, category_is_published
+        ON blog_feedentry
+        BEGIN
+            UPDATE blog_tablesize
+            SET rows = rows
+                + ({LISTED.format(row='NEW')})
+                - ({LISTED.format(row='OLD')})
+            WHERE "table" = '{COUNTER}';
+        END
+        """)
+
+
+def drop_counter(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for action in ("insert", "delete", "update"):
+        schema_editor.execute(
+            f"DROP TRIGGER IF EXISTS blog_feedentry_listed_{action}"
+        )
+    schema_editor.execute(
+        f"DELETE FROM blog_tablesize WHERE \"table\" = '{COUNTER}'"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0016_comment_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_counter, drop_counter),
+    ]
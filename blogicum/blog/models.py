@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils.timezone import now
+
+from .storage import post_image_storage
 
 User = get_user_model()
 
@@ -51,6 +54,50 @@ class Category(models.Model):
         return self.title
 
 
+class ImageStatus(models.TextChoices):
+    READY = "ready", "Готово"
+    PENDING = "pending", "В очереди"
+    PROCESSING = "processing", "Обрабатывается"
+    FAILED = "failed", "Ошибка"
+
+
+class PostQuerySet(models.QuerySet):
+    # Колонки, которые нужны карточке поста в ленте.
+    FEED_FIELDS = (
+        "id",
+        "title",
+        "text",
+        "pub_date",
+        "is_published",
+        "image",
+        "image_variants",
+        "comment_count",
+        "author__id",
+        "author__username",
+        "category__id",
+        "category__title",
+        "category__slug",
+        "category__is_published",
+        "location__id",
+        "location__name",
+        "location__is_published",
+    )
+
+    def published(self):
+        return self.filter(
+            is_published=True,
+            pub_date__lte=now(),
+            category__is_published=True,
+        )
+
+    def feed(self):
+        return (
+            self.select_related("author", "category", "location")
+            .only(*self.FEED_FIELDS)
+            .order_by("-pub_date", "-id")
+        )
+
+
 class Post(models.Model):
     title = models.CharField(max_length=256, verbose_name="Заголовок")
     text = models.TextField(verbose_name="Текст")
@@ -91,13 +138,54 @@ class Post(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name="Добавлено"
     )
+    # Обновляется и при изменении комментариев к посту.
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Изменено")
     image = models.ImageField(
-        upload_to="posts/", blank=True, null=True, verbose_name="Изображение"
+        upload_to="posts/",
+        storage=post_image_storage,
+        blank=True,
+        null=True,
+        verbose_name="Изображение",
+    )
+    # Размеры оригинала и уменьшенные копии, см. blog.images.
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Варианты изображения",
     )
+    image_status = models.CharField(
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.READY,
+        editable=False,
+        verbose_name="Обработка изображения",
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Количество комментариев",
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
+        indexes = [
+            models.Index(
+                fields=["is_published", "pub_date"],
+                name="post_published_pub_date_idx",
+            ),
+            models.Index(
+                fields=["category", "is_published", "pub_date"],
+                name="post_category_feed_idx",
+            ),
+            models.Index(
+                fields=["author", "pub_date"],
+                name="post_author_pub_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -111,5 +199,135 @@ class Comment(models.Model):
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["post", "created_at"],
+                name="comment_post_created_at_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Комментарий {self.author} к {self.post}"
+
+
+class ImageJob(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="image_jobs",
+        verbose_name="Публикация",
+    )
+    image = models.CharField(max_length=255, verbose_name="Исходный файл")
+    status = models.CharField(
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Попыток"
+    )
+    error = models.TextField(blank=True, verbose_name="Ошибка")
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Добавлено"
+    )
+    started_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Начато"
+    )
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Завершено"
+    )
+
+    class Meta:
+        verbose_name = "обработка изображения"
+        verbose_name_plural = "Обработка изображений"
+        ordering = ("id",)
+        indexes = [
+            models.Index(
+                fields=["status", "id"], name="imagejob_status_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.image} ({self.get_status_display()})"
+
+
+class MediaFile(models.Model):
+    """Число ссылок на файл в хранилище с адресацией по содержимому.
+
+    Один файл может принадлежать нескольким постам; он удаляется, когда
+    на него не остаётся ни одной ссылки (см. blog.media).
+    """
+
+    name = models.CharField(
+        max_length=255, unique=True, verbose_name="Имя файла"
+    )
+    refs = models.PositiveIntegerField(default=0, verbose_name="Ссылок")
+
+    class Meta:
+        verbose_name = "файл"
+        verbose_name_plural = "Файлы"
+
+    def __str__(self):
+        return f"{self.name} ({self.refs})"
+
+
+class TableSize(models.Model):
+    """Число строк таблицы, которое поддерживают триггеры SQLite.
+
+    Позволяет узнать размер большой таблицы без COUNT(*); на PostgreSQL
+    вместо этой таблицы используется оценка планировщика (blog.counting).
+    """
+
+    table = models.CharField(
+        max_length=63, unique=True, verbose_name="Таблица"
+    )
+    rows = models.BigIntegerField(default=0, verbose_name="Строк")
+
+    class Meta:
+        verbose_name = "размер таблицы"
+        verbose_name_plural = "Размеры таблиц"
+
+    def __str__(self):
+        return f"{self.table}: {self.rows}"
+
+
+class FeedEntry(models.Model):
+    """Строка материализованной ленты: всё, что нужно для отбора постов.
+
+    id совпадает с id поста. Лента выбирается диапазоном по одному из
+    индексов этой таблицы без соединений с категориями и авторами, а
+    посты страницы затем загружаются по первичному ключу. Записи
+    поддерживают сигналы (blog.feed); сверить и пересобрать их можно
+    командой rebuild_feed.
+    """
+
+    id = models.BigIntegerField(primary_key=True, verbose_name="Публикация")
+    category_id = models.BigIntegerField(null=True, verbose_name="Категория")
+    author_id = models.BigIntegerField(verbose_name="Автор")
+    pub_date = models.DateTimeField(verbose_name="Дата и время публикации")
+    is_published = models.BooleanField(verbose_name="Опубликовано")
+    category_is_published = models.BooleanField(
+        verbose_name="Категория опубликована"
+    )
+
+    class Meta:
+        verbose_name = "запись ленты"
+        verbose_name_plural = "Записи ленты"
+        indexes = [
+            models.Index(
+                fields=["-pub_date", "-id"], name="feed_entry_pub_date_idx"
+            ),
+            models.Index(
+                fields=["category_id", "-pub_date", "-id"],
+                name="feed_entry_category_idx",
+            ),
+            models.Index(
+                fields=["author_id", "-pub_date", "-id"],
+                name="feed_entry_author_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.id}: {self.pub_date:%Y-%m-%d %H:%M}"
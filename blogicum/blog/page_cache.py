@@ -0,0 +1,159 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils import timezone
+
+from . import schedule
+from .async_support import database
+
+CACHE_HEADER = "X-Page-Cache"
+
+
+def get_page_cache():
+    return caches[settings.BLOG_PAGE_CACHE_ALIAS]
+
+
+def _tag_key(tag):
+    return f"page-tag:{tag}"
+
+
+def invalidate_tags(*tags):
+    """Сделать устаревшими все страницы, помеченные любым из `tags`."""
+    version = time.time_ns()
+    get_page_cache().set_many({_tag_key(tag): version for tag in tags}, None)
+
+
+def tag_versions(tags):
+    """Версии тегов; версия — время последней инвалидации в наносекундах."""
+    cache = get_page_cache()
+    tag_keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(tag_keys)
+    missing = {k: time.time_ns() for k in tag_keys if k not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[k] for k in tag_keys]
+
+
+def tags_changed_at(tags):
+    """Момент последнего изменения данных, помеченных любым из `tags`."""
+    return datetime.fromtimestamp(
+        max(tag_versions(tags)) / 1e9, tz=dt_timezone.utc
+    )
+
+
+def _page_key(request, tags):
+    parts = [f"page:{request.get_full_path()}"]
+    parts.extend(str(version) for version in tag_versions(tags))
+    return ":".join(parts)
+
+
+def _is_cacheable_request(request):
+    return (
+        request.method in ("GET", "HEAD") and not request.user.is_authenticated
+    )
+
+
+def _is_cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_USED")
+    )
+
+
+def _cached_response(request, tags):
+    """Вернуть (ключ, ответ из кеша); ключ None — страницу не кешировать."""
+    if not _is_cacheable_request(request):
+        return None, None
+    key = _page_key(request, tags)
+    entry = get_page_cache().get(key)
+    if entry is None or entry["expires_at"] <= timezone.now():
+        return key, None
+    response = HttpResponse(
+        entry["content"], content_type=entry["content_type"]
+    )
+    response[CACHE_HEADER] = "HIT"
+    return key, response
+
+
+def _store_response(request, response, key, feed_args):
+    if hasattr(response, "render") and callable(response.render):
+        response = response.render()
+    if not _is_cacheable_response(request, response):
+        return response
+
+    timeout = settings.BLOG_PAGE_CACHE_TIMEOUT
+    if feed_args is None:
+        expires_at = timezone.now() + timedelta(seconds=timeout)
+    else:
+        expires_at = schedule.feed_expires_at(timeout, **feed_args)
+    get_page_cache().set(
+        key,
+        {
+            "content": response.content,
+            "content_type": response["Content-Type"],
+            "expires_at": expires_at,
+        },
+        max(int((expires_at - timezone.now()).total_seconds()), 1),
+    )
+    response[CACHE_HEADER] = "MISS"
+    return response
+
+
+def anonymous_page_cache(tags, feed=None):
+    """Кешировать ответ целиком для анонимных посетителей.
+
+    `tags` — функция, которая по аргументам представления возвращает
+    список тегов страницы; изменение данных сбрасывает теги через
+    `invalidate_tags`. Запись живёт не дольше BLOG_PAGE_CACHE_TIMEOUT.
+    Для лент `feed` возвращает аргументы `schedule.next_publication`,
+    и запись истекает ровно к ближайшей отложенной публикации ленты.
+    Подходит и для async def: тогда в потоке выполняются только
+    обращения к кешу и базе, а представление выполняется в цикле событий.
+    """
+
+    def feed_args(args, kwargs):
+        return feed(*args, **kwargs) if feed is not None else None
+
+    def decorator(view_func):
+        if asyncio.iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                key, cached = await database(_cached_response)(
+                    request, tags(*args, **kwargs)
+                )
+                if cached is not None:
+                    return cached
+                response = await view_func(request, *args, **kwargs)
+                if key is None:
+                    return response
+                return await database(_store_response)(
+                    request, response, key, feed_args(args, kwargs)
+                )
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key, cached = _cached_response(request, tags(*args, **kwargs))
+            if cached is not None:
+                return cached
+            response = view_func(request, *args, **kwargs)
+            if key is None:
+                return response
+            return _store_response(
+                request, response, key, feed_args(args, kwargs)
+            )
+
+        return wrapper
+
+    return decorator
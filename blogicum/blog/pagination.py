@@ -0,0 +1,235 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+from . import counting
+
+PAGE_WINDOW_ON_EACH_SIDE = 2
+PAGE_WINDOW_ON_ENDS = 1
+# Id в курсоре должен помещаться в целочисленную колонку базы.
+MAX_CURSOR_ID = 2**63 - 1
+# Как и id, OFFSET страницы ограничен 64-битным целым.
+MAX_OFFSET = 2**63 - 1
+
+
+def encode_key(moment, pk, reverse=False):
+    """Закодировать ключ (дата, id) в токен для URL."""
+    payload = {"d": moment.isoformat(), "i": pk}
+    if reverse:
+        payload["r"] = 1
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def encode_cursor(post, reverse=False):
+    return encode_key(post.pub_date, post.id, reverse)
+
+
+def decode_cursor(token):
+    """Вернуть (дата, id, reverse) или None для битого токена.
+
+    Битым считается и поддельный токен, который база не смогла бы
+    сравнить: id вне 1..2**63-1 или дата без часового пояса.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        moment = datetime.fromisoformat(payload["d"])
+        pk = int(payload["i"])
+        reverse = bool(payload.get("r"))
+    except (
+        binascii.Error,
+        ValueError,
+        TypeError,
+        KeyError,
+        UnicodeDecodeError,
+    ):
+        return None
+    if moment.utcoffset() is None or not 1 <= pk <= MAX_CURSOR_ID:
+        return None
+    return moment, pk, reverse
+
+
+class CursorPage(Sequence):
+    """Страница ленты, полученная по ключу (pub_date, id) без OFFSET."""
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Постраничный вывод ленты, отсортированной по (-pub_date, -id).
+
+    Каждая страница — это диапазон по индексу, поэтому глубокие страницы
+    открываются так же быстро, как первая, а COUNT(*) не выполняется.
+    `load` читает срез `queryset` и возвращает строки страницы в том же
+    порядке; у строк должны быть pub_date и id.
+    """
+
+    def __init__(self, queryset, per_page, load=list):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.load = load
+
+    def get_page(self, token):
+        cursor = decode_cursor(token) if token else None
+        if cursor is None:
+            return self._page_after(self.queryset, first=True)
+        pub_date, post_id, reverse = cursor
+        if reverse:
+            queryset = self.queryset.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=post_id)
+            )
+            return self._page_before(queryset)
+        queryset = self.queryset.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=post_id)
+        )
+        return self._page_after(queryset, first=False)
+
+    def _page_after(self, queryset, first):
+        rows = self.load(
+            queryset.order_by("-pub_date", "-id")[: self.per_page + 1]
+        )
+        has_next = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        return CursorPage(
+            rows,
+            next_cursor=encode_cursor(rows[-1]) if has_next else None,
+            previous_cursor=(
+                encode_cursor(rows[0], reverse=True)
+                if rows and not first
+                else None
+            ),
+        )
+
+    def _page_before(self, queryset):
+        rows = self.load(
+            queryset.order_by("pub_date", "id")[: self.per_page + 1]
+        )
+        has_previous = len(rows) > self.per_page
+        rows = rows[: self.per_page][::-1]
+        return CursorPage(
+            rows,
+            next_cursor=encode_cursor(rows[-1]) if rows else None,
+            previous_cursor=(
+                encode_cursor(rows[0], reverse=True) if has_previous else None
+            ),
+        )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который на больших выборках не выполняет точный COUNT(*).
+
+    Число строк берётся из blog.counting.count: выше
+    BLOG_EXACT_COUNT_LIMIT это оценка, count_is_exact — False, страницы
+    за оценённой границей всё равно открываются, если в них есть строки,
+    а в ряду номеров нет последней страницы.
+    """
+
+    def __init__(self, *args, tags=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tags = tags
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.count_is_exact = counting.count(
+            self.object_list, self.tags
+        )
+        return count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            number = int(number)
+            if (
+                self.count_is_exact
+                or number < 1
+                or number * self.per_page > MAX_OFFSET
+                or not self._has_rows(number)
+            ):
+                raise
+            return number
+
+    def _has_rows(self, number):
+        # Страница за оценённой границей: проверяем, что она не пуста.
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom:bottom + 1].exists()
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_is_exact:
+            return super().page(number)
+        # Paginator обрезал бы срез по count, который здесь неточен.
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        return self._get_page(self.object_list[bottom:top], number, self)
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3, on_ends=2):
+        number = self.validate_number(number)
+        if self.count_is_exact:
+            yield from super().get_elided_page_range(
+                number, on_each_side=on_each_side, on_ends=on_ends
+            )
+            return
+        if number > on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        last = min(number + on_each_side, self.num_pages)
+        yield from range(number + 1, last + 1)
+        yield self.ELLIPSIS
+
+
+def paginate_feed(queryset, request, per_page, load=list):
+    """Разбить ленту на страницы в режиме из BLOG_FEED_PAGINATION.
+
+    Ссылка с ?cursor= открывается в курсорном режиме при любой настройке.
+    `load` читает срез `queryset` — строки страницы, как в
+    CursorPaginator.
+    """
+    token = request.GET.get("cursor")
+    mode = getattr(settings, "BLOG_FEED_PAGINATION", "offset")
+    if token is not None or mode == "cursor":
+        return CursorPaginator(queryset, per_page, load).get_page(token)
+
+    paginator = EstimatedCountPaginator(queryset, per_page, tags=["feed"])
+    page_obj = paginator.get_page(request.GET.get("page"))
+    page_obj.object_list = load(page_obj.object_list)
+    page_obj.elided_page_range = paginator.get_elided_page_range(
+        page_obj.number,
+        on_each_side=PAGE_WINDOW_ON_EACH_SIDE,
+        on_ends=PAGE_WINDOW_ON_ENDS,
+    )
+    return page_obj
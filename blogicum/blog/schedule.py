@@ -0,0 +1,80 @@
+"""Индекс отложенных публикаций.
+
+Пост с датой публикации в будущем появляется в ленте без записи в базу —
+просто наступает его время. Кешам лент нужно знать этот момент, чтобы
+выставить точный срок жизни записи вместо короткого общего TTL.
+"""
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Post
+
+VERSION_KEY = "schedule-version"
+# Значение в кеше, означающее «отложенных публикаций нет».
+NOTHING_SCHEDULED = "none"
+ENTRY_TIMEOUT = 24 * 60 * 60
+
+
+def invalidate():
+    """Сбросить индекс после изменения постов или категорий."""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(VERSION_KEY, version, None)
+    return version
+
+
+def _scheduled_posts(category, author):
+    posts = Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=timezone.now(),
+    )
+    if category is not None:
+        posts = posts.filter(category__slug=category)
+    if author is not None:
+        posts = posts.filter(author__username=author)
+    return posts
+
+
+def next_publication(category=None, author=None):
+    """Вернуть дату ближайшей отложенной публикации ленты или None.
+
+    Без аргументов — для общей ленты, `category` — слаг категории,
+    `author` — имя пользователя для ленты профиля.
+    """
+    key = f"schedule:{_version()}:{category or ''}:{author or ''}"
+    cached = cache.get(key)
+    if cached == NOTHING_SCHEDULED:
+        return None
+    if cached is not None and cached > timezone.now():
+        return cached
+
+    pub_date = (
+        _scheduled_posts(category, author)
+        .order_by("pub_date")
+        .values_list("pub_date", flat=True)
+        .first()
+    )
+    cache.set(key, pub_date or NOTHING_SCHEDULED, ENTRY_TIMEOUT)
+    return pub_date
+
+
+def feed_expires_at(timeout, category=None, author=None):
+    """Момент, до которого закешированная лента остаётся верной.
+
+    Это ближайшая отложенная публикация ленты, но не позже, чем через
+    `timeout` секунд.
+    """
+    expires_at = timezone.now() + timedelta(seconds=timeout)
+    pub_date = next_publication(category=category, author=author)
+    if pub_date is not None and pub_date < expires_at:
+        return pub_date
+    return expires_at
@@ -0,0 +1,194 @@
+"""Полнотекстовый поиск по постам и комментариям.
+
+На SQLite ищет по таблицам FTS5 blog_post_fts и blog_comment_fts,
+которые поддерживают триггеры (миграции 0013 и 0016), на PostgreSQL — по
+tsvector с конфигурацией russian. FTS5 не умеет русскую морфологию,
+поэтому слова запроса приводятся к основе стеммером Snowball и ищутся
+как префиксы: «котами» → «кот*» находит и «кот», и «кота».
+"""
+import re
+
+import snowballstemmer
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+MAX_TERMS = 10
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+CYRILLIC_RE = re.compile(r"[а-яё]")
+# Маркеры подсветки, которых не бывает в тексте постов; заменяются на
+# <mark> после экранирования.
+MARK_START = "\x02"
+MARK_END = "\x03"
+SNIPPET_WORDS = 24
+TITLE_WEIGHT = 10.0
+
+_stemmers = {
+    "russian": snowballstemmer.stemmer("russian"),
+    "english": snowballstemmer.stemmer("english"),
+}
+
+
+def stem(word):
+    word = word.lower().replace("ё", "е")
+    language = "russian" if CYRILLIC_RE.search(word) else "english"
+    stemmed = _stemmers[language].stemWord(word)
+    return stemmed if len(stemmed) > 1 else word
+
+
+def query_terms(query):
+    """Основы слов запроса без повторов, не больше MAX_TERMS."""
+    terms = []
+    for word in WORD_RE.findall(query):
+        term = stem(word)
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def highlighted(text):
+    """Экранировать `text` и превратить маркеры подсветки в <mark>."""
+    return mark_safe(
+        escape(text).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+    )
+
+
+def _match(terms):
+    """Выражение FTS5 MATCH: все основы как префиксы."""
+    return " ".join('"{}"*'.format(term.replace('"', "")) for term in terms)
+
+
+def _tsquery(terms):
+    from django.contrib.postgres.search import SearchQuery
+
+    return SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        config="russian",
+        search_type="raw",
+    )
+
+
+def _vector(model):
+    """Выражение tsvector модели — то же, что в индексе из миграций."""
+    from django.contrib.postgres.search import SearchVector
+
+    if model._meta.model_name == "comment":
+        return SearchVector("text", config="russian")
+    return SearchVector("title", weight="A", config="russian") + (
+        SearchVector("text", weight="B", config="russian")
+    )
+
+
+def _search_sqlite(terms, limit):
+    match = _match(terms)
+    sql = f"""
+        SELECT rowid,
+               highlight(blog_post_fts, 0, %s, %s),
+               snippet(blog_post_fts, 1, %s, %s, '…', {SNIPPET_WORDS})
+        FROM blog_post_fts
+        WHERE blog_post_fts MATCH %s
+        ORDER BY bm25(blog_post_fts, {TITLE_WEIGHT}, 1.0)
+        LIMIT %s
+    """
+    params = [MARK_START, MARK_END, MARK_START, MARK_END, match, limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _search_postgresql(terms, limit):
+    from django.contrib.postgres.search import SearchHeadline, SearchRank
+
+    from .models import Post
+
+    query = _tsquery(terms)
+    vector = _vector(Post)
+    options = {
+        "config": "russian",
+        "start_sel": MARK_START,
+        "stop_sel": MARK_END,
+    }
+    return list(
+        Post.objects.annotate(search=vector)
+        .filter(search=query)
+        .annotate(
+            rank=SearchRank(vector, query),
+            title_hl=SearchHeadline(
+                "title", query, highlight_all=True, **options
+            ),
+            text_hl=SearchHeadline(
+                "text", query, max_words=SNIPPET_WORDS, **options
+            ),
+        )
+        .order_by("-rank", "-pub_date")
+        .values_list("id", "title_hl", "text_hl")[:limit]
+    )
+
+
+def search(query, limit=None):
+    """Найти посты по запросу `query`, от самых подходящих.
+
+    Возвращает список (id, заголовок, фрагмент текста); в заголовке и
+    фрагменте найденные слова обёрнуты маркерами MARK_START/MARK_END.
+    Видимость постов не проверяется — это дело вызывающего.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    limit = limit or settings.BLOG_SEARCH_MAX_RESULTS
+    if connection.vendor == "postgresql":
+        return _search_postgresql(terms, limit)
+    return _search_sqlite(terms, limit)
+
+
+def filter_matching(queryset, query):
+    """Посты или комментарии из `queryset`, найденные по `query`.
+
+    В отличие от search, число результатов не ограничено, а порядок
+    остаётся порядком `queryset`: индекс только отбирает строки. Нужен
+    админке, где найденное показывается постранично целиком.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == "postgresql":
+        return queryset.annotate(search=_vector(queryset.model)).filter(
+            search=_tsquery(terms)
+        )
+    table = f"{queryset.model._meta.db_table}_fts"
+    return queryset.filter(
+        pk__in=RawSQL(
+            f"SELECT rowid FROM {table} WHERE {table} MATCH %s",
+            [_match(terms)],
+        )
+    )
+
+
+def search_page(posts, query, number, per_page):
+    """Страница `number` постов из `posts`, найденных по `query`.
+
+    Из базы целиком загружаются только посты этой страницы; у каждого
+    есть атрибуты search_title и search_snippet с подсветкой.
+    """
+    hits = search(query)
+    visible = set(
+        posts.filter(pk__in=[hit[0] for hit in hits]).values_list(
+            "pk", flat=True
+        )
+    )
+    hits = [hit for hit in hits if hit[0] in visible]
+    page_obj = Paginator(hits, per_page).get_page(number)
+    page_hits = {post_id: (title, text) for post_id, title, text in page_obj}
+    loaded = posts.filter(pk__in=page_hits).feed().in_bulk()
+    page_obj.object_list = []
+    for post_id, (title, text) in page_hits.items():
+        post = loaded.get(post_id)
+        if post is None:
+            continue
+        post.search_title = highlighted(title)
+        post.search_snippet = highlighted(text)
+        page_obj.object_list.append(post)
+    return page_obj
@@ -0,0 +1,146 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import card_cache, db, feed, media, page_cache, schedule
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+MEDIA_FIELDS = {"image", "image_variants"}
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    # Изменение обсуждения меняет и страницу поста, поэтому updated_at
+    # поста сдвигается вместе со счётчиком.
+    changes = {"updated_at": timezone.now()}
+    if created:
+        changes["comment_count"] = F("comment_count") + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+    card_cache.invalidate("post", instance.post_id)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    # Сигнал приходит и при каскадном удалении, и при массовом удалении
+    # из админки, поэтому счётчик не расходится с таблицей комментариев.
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0),
+        updated_at=timezone.now(),
+    )
+    card_cache.invalidate("post", instance.post_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    page_cache.invalidate_tags("feed", f"post:{instance.post_id}")
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_caches(sender, instance, **kwargs):
+    card_cache.invalidate("post", instance.pk)
+    page_cache.invalidate_tags("feed", f"post:{instance.pk}")
+    schedule.invalidate()
+
+
+@receiver(post_save, sender=Post)
+def update_feed_entry(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not feed.SOURCE_FIELDS & set(
+        update_fields
+    ):
+        return
+    feed.refresh([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def delete_feed_entry(sender, instance, **kwargs):
+    feed.forget(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_media(sender, instance, update_fields=None, **kwargs):
+    # Сохранение, не затрагивающее изображение, не меняет и ссылки.
+    instance._previous_media = None
+    if update_fields is not None and not MEDIA_FIELDS & set(update_fields):
+        return
+    previous = None
+    if instance.pk is not None:
+        previous = (
+            Post.objects.filter(pk=instance.pk)
+            .values_list("image", "image_variants")
+            .first()
+        )
+    instance._previous_media = (
+        media.referenced_names(*previous) if previous else set()
+    )
+
+
+@receiver(post_save, sender=Post)
+def count_post_media(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_media", None)
+    if previous is None:
+        return
+    current = media.referenced_names(
+        instance.image.name, instance.image_variants
+    )
+    media.acquire(current - previous)
+    media.release(previous - current)
+    instance._previous_media = None
+
+
+@receiver(post_delete, sender=Post)
+def release_post_media(sender, instance, **kwargs):
+    # Файл удаляется, только если его не использует другой пост.
+    media.release(
+        media.referenced_names(instance.image.name, instance.image_variants)
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_caches(sender, instance, **kwargs):
+    card_cache.invalidate("category", instance.pk)
+    page_cache.invalidate_tags("feed", "catalog")
+    schedule.invalidate()
+
+
+@receiver(post_save, sender=Category)
+def update_category_feed_entries(sender, instance, **kwargs):
+    feed.category_changed(instance)
+
+
+@receiver(post_delete, sender=Category)
+def detach_category_feed_entries(sender, instance, **kwargs):
+    feed.category_deleted(instance.pk)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_caches(sender, instance, **kwargs):
+    card_cache.invalidate("location", instance.pk)
+    page_cache.invalidate_tags("feed", "catalog")
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_caches(sender, instance, update_fields=None, **kwargs):
+    # Вход в систему сохраняет только last_login; страницы от этого не
+    # меняются, а на ленты приходится большая часть трафика.
+    if update_fields is not None and "username" not in update_fields:
+        return
+    card_cache.invalidate("author", instance.pk)
+    page_cache.invalidate_tags("feed", "catalog")
+    schedule.invalidate()
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor == "sqlite":
+        db.apply_pragmas(connection.connection, settings.BLOG_SQLITE_PRAGMAS)
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+# Файл по такому адресу никогда не меняется, поэтому его можно кешировать
+# сколько угодно долго.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+HASHED_NAME_RE = re.compile(
+    r"(?:^|/)(?P<a>[0-9a-f]{2})/(?P<b>[0-9a-f]{2})/"
+    r"(?P=a)(?P=b)[0-9a-f]{60}(?:\.[0-9a-z]+)?$"
+)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, в котором имя файла — SHA-256 его содержимого.
+
+    Одинаковые файлы хранятся один раз: `posts/photo.jpg` сохраняется как
+    `posts/ab/cd/abcd….jpg`, а повторная загрузка тех же байтов
+    возвращает уже существующее имя. Содержимое пишется во временный
+    файл и хешируется за один проход, затем атомарно переименовывается,
+    поэтому конкурирующие загрузки одного файла друг другу не мешают.
+    Учёт ссылок на файлы ведёт blog.media.
+    """
+
+    @staticmethod
+    def hashed_name(name, digest):
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(
+            directory, digest[:2], digest[2:4], f"{digest}{extension}"
+        )
+
+    @staticmethod
+    def is_hashed_name(name):
+        return HASHED_NAME_RE.search(name) is not None
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        directory = self.path(posixpath.dirname(name))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    fh.write(chunk)
+            name = self.hashed_name(name, digest.hexdigest())
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
+
+
+def post_image_storage():
+    return ContentAddressedStorage()
@@ -0,0 +1,39 @@
+from django import template
+
+from blog.images import image_storage
+
+register = template.Library()
+
+# Ширина колонки с карточкой поста — 40rem.
+DEFAULT_SIZES = "(max-width: 640px) 100vw, 640px"
+
+
+def _srcset(entries, storage):
+    return ", ".join(
+        f"{storage.url(name)} {width}w" for width, name in entries
+    )
+
+
+@register.inclusion_tag("includes/post_image.html")
+def post_image(post, css_class="", sizes=DEFAULT_SIZES):
+    variants = post.image_variants or {}
+    sources = variants.get("sources", {})
+    storage = image_storage()
+
+    fallback = next(
+        (entries for fmt, entries in sources.items() if fmt != "webp"), None
+    )
+    srcset = ""
+    if fallback is not None:
+        original = [variants["width"], post.image.name]
+        srcset = _srcset(fallback + [original], storage)
+    return {
+        "src": post.image.url,
+        "srcset": srcset,
+        "webp_srcset": _srcset(sources.get("webp", []), storage),
+        "sizes": sizes,
+        "width": variants.get("width"),
+        "height": variants.get("height"),
+        "css_class": css_class,
+        "alt": post.title,
+    }
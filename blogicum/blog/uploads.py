@@ -0,0 +1,118 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.template.defaultfilters import filesizeformat
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from PIL import Image, ImageFile
+
+# Если заголовок не найден в первых байтах, файл не считается
+# изображением; окончательную проверку делает ImageField формы.
+HEADER_SEARCH_LIMIT = 1024 * 1024
+
+
+class StreamingImageUploadHandler(FileUploadHandler):
+    """Принимает изображения кусками во временный файл.
+
+    Файл отклоняется, как только становится ясно, что он слишком велик,
+    или как только из заголовка видно, что картинка после распаковки
+    займёт больше BLOG_IMAGE_MAX_PIXELS пикселей, — до полного чтения
+    и декодирования.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        if request is not None and not hasattr(request, "upload_errors"):
+            request.upload_errors = {}
+
+    def _reject(self, message):
+        self.file.close()
+        if self.request is not None:
+            self.request.upload_errors[self.field_name] = message
+        raise SkipFile(message)
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.size = 0
+        self.parser = ImageFile.Parser()
+        self.file = TemporaryUploadedFile(
+            self.file_name,
+            self.content_type,
+            0,
+            self.charset,
+            self.content_type_extra,
+        )
+        max_size = settings.BLOG_IMAGE_MAX_UPLOAD_SIZE
+        if self.content_length and self.content_length > max_size:
+            self._reject(self._too_large_message())
+
+    def _too_large_message(self):
+        return (
+            "Файл слишком большой: допускается не более "
+            f"{filesizeformat(settings.BLOG_IMAGE_MAX_UPLOAD_SIZE)}."
+        )
+
+    def _inspect_header(self, raw_data):
+        if self.parser is None:
+            return
+        max_pixels = settings.BLOG_IMAGE_MAX_PIXELS
+        try:
+            self.parser.feed(raw_data)
+        except Image.DecompressionBombError:
+            # Pillow сам отказывается открывать такие картинки.
+            self._reject(
+                "Изображение слишком велико: допускается не более "
+                f"{max_pixels} пикселей."
+            )
+        except (OSError, SyntaxError, ValueError):
+            self.parser = None
+            return
+        image = self.parser.image
+        if image is None:
+            if self.size > HEADER_SEARCH_LIMIT:
+                self.parser = None
+            return
+        # Размеры известны: дальше декодировать в памяти незачем.
+        self.parser = None
+        width, height = image.size
+        if width * height > max_pixels:
+            self._reject(
+                f"Изображение {width}×{height} слишком велико: допускается "
+                f"не более {max_pixels} пикселей."
+            )
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > settings.BLOG_IMAGE_MAX_UPLOAD_SIZE:
+            self._reject(self._too_large_message())
+        self._inspect_header(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        self.file.size = file_size
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            self.file.close()
+
+
+def streaming_image_uploads(view_func):
+    """Принимать файлы в представлении через StreamingImageUploadHandler.
+
+    Обработчики загрузки можно заменить только до первого обращения к
+    request.POST, а CsrfViewMiddleware читает его раньше представления,
+    поэтому проверка CSRF переносится внутрь декоратора.
+    """
+
+    @wraps(view_func)
+    @csrf_exempt
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers = [StreamingImageUploadHandler(request)]
+        return csrf_protect(view_func)(request, *args, **kwargs)
+
+    return wrapper
@@ -1,8 +1,11 @@
-﻿from django.urls import path
+﻿from django.conf import settings
+from django.urls import path
 from .views import (
     index,
     category_posts,
     post_detail,
+    post_comments,
+    search,
     create_post,
     profile,
     UserRegisterView,
@@ -14,12 +17,17 @@ from .views import (
     delete_comment,
 )
 
+if settings.BLOG_ASYNC_VIEWS:
+    from .async_views import index, category_posts, post_detail, profile
+
 app_name = "blog"
 
 urlpatterns = [
     path("", index, name="index"),
     path("category/<slug:category_slug>/", category_posts, name="category_posts"),
     path("posts/<int:post_id>/", post_detail, name="post_detail"),
+    path("posts/<int:post_id>/comments/", post_comments, name="post_comments"),
+    path("search/", search, name="search"),
     path("posts/create/", create_post, name="create_post"),
     path("auth/registration/", UserRegisterView.as_view(), name="registration"),
     path("profile/<str:username>/", profile, name="profile"),
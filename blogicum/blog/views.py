@@ -5,13 +5,26 @@ from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
-from django.core.paginator import Paginator
-from django.views.decorators.http import require_http_methods
-from django.http import Http404
-from django.db.models import Count
+from django.views.decorators.http import require_http_methods, require_safe
+from django.http import Http404, JsonResponse
+from django.template.loader import render_to_string
 
 from .models import Post, Category, Comment
+from .comments import (
+    comments_after,
+    comments_page,
+    cursor_after,
+    page_with,
+    per_page,
+)
 from .forms import PostForm, CommentForm
+from .feed import author_entries, category_entries, entries, paginate
+from .jobs import schedule_image_processing
+from .pagination import decode_cursor
+from .search import search_page
+from .page_cache import anonymous_page_cache
+from .conditional import conditional_page
+from .uploads import streaming_image_uploads
 from django.contrib.auth.views import LoginView
 
 
@@ -27,19 +40,29 @@ class UserRegisterView(CreateView):
 
 
 def filter_published_posts(queryset):
-    return queryset.filter(
-        is_published=True,
-        pub_date__lte=now(),
-        category__is_published=True,
+    return queryset.published()
+
+
+def _profile_feed(request, username):
+    return author_entries(
+        username, published=request.user.username != username
     )
 
 
+def _index_feed(request):
+    return entries()
+
+
+def _category_feed(request, category_slug):
+    return category_entries(category_slug)
+
+
+@conditional_page(feed=_profile_feed, tags=["feed", "catalog"])
 def profile(request, username):
     profile_user = get_object_or_404(User, username=username)
-    if request.user == profile_user:
-        posts = get_posts_with_comment_count(Post.objects.filter(author=profile_user))
-    else:
-        posts = get_posts_with_comment_count(filter_published_posts(Post.objects.filter(author=profile_user)))
+    posts = entries(
+        published=request.user != profile_user, author_id=profile_user.pk
+    )
     page_obj = paginate_queryset(posts, request)
     return render(
         request,
@@ -48,15 +71,21 @@ def profile(request, username):
     )
 
 
+@conditional_page(feed=_index_feed, tags=["feed", "catalog"])
+@anonymous_page_cache(tags=lambda: ["feed"], feed=lambda: {})
 def index(request):
-    posts = get_posts_with_comment_count(filter_published_posts(Post.objects.all()))
-    page_obj = paginate_queryset(posts, request)
+    page_obj = paginate_queryset(entries(), request)
     return render(request, "blog/index.html", {"page_obj": page_obj})
 
 
+@conditional_page(feed=_category_feed, tags=["feed", "catalog"])
+@anonymous_page_cache(
+    tags=lambda category_slug: ["feed"],
+    feed=lambda category_slug: {"category": category_slug},
+)
 def category_posts(request, category_slug):
     category = get_object_or_404(Category, slug=category_slug, is_published=True)
-    posts = get_posts_with_comment_count(filter_published_posts(Post.objects.filter(category=category)))
+    posts = entries(category_id=category.pk)
     page_obj = paginate_queryset(posts, request)
     return render(
         request,
@@ -65,33 +94,116 @@ def category_posts(request, category_slug):
     )
 
 
-def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-
+def get_visible_post(request, post_id):
+    """Пост, который может видеть пользователь, или Http404."""
+    post = get_object_or_404(
+        Post.objects.select_related("author", "category", "location"),
+        pk=post_id,
+    )
     if request.user != post.author and (
         not post.is_published
         or not post.category.is_published
         or post.pub_date > now()
     ):
         raise Http404
+    return post
+
+
+def _detail_posts(request, post_id):
+    return Post.objects.filter(pk=post_id)
 
-    comments = post.comments.order_by("created_at")
+
+@conditional_page(posts=_detail_posts, tags=["catalog"])
+@anonymous_page_cache(tags=lambda post_id: [f"post:{post_id}", "catalog"])
+def post_detail(request, post_id):
+    post = get_visible_post(request, post_id)
+    comments = comments_page(post, request.GET.get("comments_page"))
     form = CommentForm()
+    # С первой страницы остальные комментарии подгружаются по курсору.
+    comments_cursor = None
+    if comments.number == 1 and comments.has_next():
+        comments_cursor = cursor_after(comments[len(comments) - 1])
 
     return render(
         request,
         "blog/detail.html",
-        {"post": post, "comments": comments, "form": form},
+        {
+            "post": post,
+            "comments": comments,
+            "comments_cursor": comments_cursor,
+            "form": form,
+        },
+    )
+
+
+@require_safe
+def post_comments(request, post_id):
+    """Очередная порция комментариев к посту в JSON.
+
+    ?cursor= — курсор из предыдущего ответа или из страницы поста.
+    """
+    post = get_visible_post(request, post_id)
+    after = None
+    token = request.GET.get("cursor")
+    if token:
+        cursor = decode_cursor(token)
+        if cursor is None:
+            return JsonResponse({"error": "Неверный курсор."}, status=400)
+        after = cursor[:2]
+
+    comments, next_cursor = comments_after(post.pk, after, per_page())
+    html = render_to_string(
+        "includes/comment_items.html",
+        {"post": post, "comments": comments},
+        request=request,
+    )
+    return JsonResponse(
+        {
+            "comments": [
+                {
+                    "id": comment.id,
+                    "author": comment.author.username,
+                    "created_at": comment.created_at.isoformat(),
+                    "text": comment.text,
+                }
+                for comment in comments
+            ],
+            "html": html,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@require_safe
+def search(request):
+    query = request.GET.get("q", "").strip()
+    page_obj = None
+    if query:
+        page_obj = search_page(
+            filter_published_posts(Post.objects.all()),
+            query,
+            request.GET.get("page"),
+            per_page=10,
+        )
+    return render(
+        request, "blog/search.html", {"query": query, "page_obj": page_obj}
     )
 
 
 @login_required
+@streaming_image_uploads
 def create_post(request):
-    form = PostForm(request.POST or None, files=request.FILES or None)
+    form = PostForm(
+        request.POST or None,
+        files=request.FILES or None,
+        upload_errors=request.upload_errors,
+    )
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
         post.save()
+        if post.image:
+            schedule_image_processing(post)
         return redirect("blog:profile", username=request.user.username)
     return render(request, "blog/create.html", {"form": form})
 
@@ -117,16 +229,24 @@ def edit_profile(request):
 
 
 @login_required
+@streaming_image_uploads
 def edit_post(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
 
     if request.user != post.author:
         return redirect("blog:post_detail", post_id=post.id)
 
-    form = PostForm(request.POST or None, files=request.FILES or None, instance=post)
+    form = PostForm(
+        request.POST or None,
+        files=request.FILES or None,
+        instance=post,
+        upload_errors=request.upload_errors,
+    )
 
     if form.is_valid():
         form.save()
+        if "image" in form.changed_data:
+            schedule_image_processing(post)
         return redirect("blog:post_detail", post_id=post.id)
 
     return render(request, "blog/create.html", {"form": form})
@@ -147,10 +267,18 @@ def add_comment(request, post_id):
     return redirect("blog:post_detail", post_id=post.id)
 
 
+def _comments_with_post():
+    return Comment.objects.select_related(
+        "author", "post__author", "post__category", "post__location"
+    )
+
+
 @login_required
 @require_http_methods(["GET", "POST"])
 def edit_comment(request, post_id, comment_id):
-    comment = get_object_or_404(Comment, pk=comment_id, post__pk=post_id)
+    comment = get_object_or_404(
+        _comments_with_post(), pk=comment_id, post__pk=post_id
+    )
 
     if request.user != comment.author:
         return redirect("blog:post_detail", post_id=post_id)
@@ -170,7 +298,7 @@ def edit_comment(request, post_id, comment_id):
             "form": form,
             "post": comment.post,
             "comment": comment,
-            "comments": comment.post.comments.order_by("created_at"),
+            "comments": page_with(comment),
         },
     )
 
@@ -186,13 +314,16 @@ def delete_post(request, post_id):
         post.delete()
         return redirect("blog:profile", username=request.user.username)
 
-    return render(request, "blog/detail.html", {"post": post, "confirm_delete": True})
+    form = PostForm(instance=post)
+    return render(request, "blog/create.html", {"form": form})
 
 
 @login_required
 @require_http_methods(["GET", "POST"])
 def delete_comment(request, post_id, comment_id):
-    comment = get_object_or_404(Comment, pk=comment_id, post__pk=post_id)
+    comment = get_object_or_404(
+        _comments_with_post(), pk=comment_id, post__pk=post_id
+    )
 
     if request.user != comment.author:
         return redirect("blog:post_detail", post_id=post_id)
@@ -207,17 +338,12 @@ def delete_comment(request, post_id, comment_id):
         {
             "post": comment.post,
             "comment": comment,
-            "comments": comment.post.comments.order_by("created_at"),
+            "comments": page_with(comment),
             "confirm_delete": True,
         },
     )
 
 
-def get_posts_with_comment_count(queryset):
-    return queryset.annotate(comment_count=Count("comments")).order_by("-pub_date")
-
-
 def paginate_queryset(queryset, request, per_page=10):
-    paginator = Paginator(queryset, per_page)
-    page_number = request.GET.get("page")
-    return paginator.get_page(page_number)
+    """Страница ленты; `queryset` — записи blog.feed.entries."""
+    return paginate(queryset, request, per_page)
@@ -7,10 +7,65 @@ For more information on this file, see
 https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
 """
 
+import asyncio
 import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
+from asgiref.sync import SyncToAsync, ThreadSensitiveContext
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogicum.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Свободные однопоточные исполнители; поток живёт дольше запроса, и его
+# соединение с базой переиспользуется, как у потоков WSGI-сервера.
+_idle_executors = []
+_slots = weakref.WeakKeyDictionary()
+
+
+class RequestThread(ThreadSensitiveContext):
+    """Свой поток для синхронного кода запроса — из постоянного пула.
+
+    ThreadSensitiveContext создаёт поток на каждый запрос, и каждый
+    запрос открывает новое соединение с базой, которое при CONN_MAX_AGE
+    никто не закрывает. Здесь поток берётся из пула на
+    BLOG_ASGI_THREADS потоков; закрытие соединений по CONN_MAX_AGE в
+    конце запроса выполняется в том же потоке.
+    """
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        slots = _slots.get(loop)
+        if slots is None:
+            slots = _slots[loop] = asyncio.Semaphore(
+                settings.BLOG_ASGI_THREADS
+            )
+        await slots.acquire()
+        self.slots = slots
+        self.executor = (
+            _idle_executors.pop()
+            if _idle_executors
+            else ThreadPoolExecutor(max_workers=1)
+        )
+        await super().__aenter__()
+        if self.token is not None:
+            SyncToAsync.context_to_thread_executor[self] = self.executor
+        return self
+
+    async def __aexit__(self, exc, value, tb):
+        # Исполнитель возвращается в пул, а не останавливается.
+        SyncToAsync.context_to_thread_executor.pop(self, None)
+        await super().__aexit__(exc, value, tb)
+        _idle_executors.append(self.executor)
+        self.slots.release()
+
+
+async def application(scope, receive, send):
+    # Django 3.2 выполняет синхронный код (middleware, шаблоны) всех
+    # запросов в одном общем потоке. Как в Django 4.0, у каждого запроса
+    # свой поток, и медленный запрос не задерживает остальные.
+    async with RequestThread():
+        await django_application(scope, receive, send)
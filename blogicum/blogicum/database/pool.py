@@ -0,0 +1,109 @@
+"""Пул соединений DB-API внутри процесса.
+
+Соединение берётся из пула вместо подключения к серверу и возвращается в
+него вместо закрытия. Перед выдачей соединение, которое пролежало в пуле
+дольше `check_after` секунд, проверяется запросом SELECT 1: упавшее
+соединение выбрасывается, а клиент получает новое.
+"""
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def _rollback(connection):
+    connection.rollback()
+    return True
+
+
+class ConnectionPool:
+    """Не больше `size` соединений, которые открывает функция `connect`.
+
+    `reset` готовит возвращённое соединение к повторному использованию и
+    возвращает False, если оно больше не годится.
+    """
+
+    def __init__(
+        self, connect, size=10, timeout=30, check_after=30, reset=_rollback
+    ):
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.reset = reset
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def acquire(self):
+        """Свободное соединение; ждёт не дольше `timeout` секунд."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(
+                f"Все {self.size} соединений пула заняты дольше "
+                f"{self.timeout} с."
+            )
+        try:
+            return self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                # Последнее возвращённое соединение — самое «тёплое».
+                item = self._idle.pop() if self._idle else None
+            if item is None:
+                return self.connect()
+            connection, returned_at = item
+            idle_for = time.monotonic() - returned_at
+            if idle_for < self.check_after or self._is_healthy(connection):
+                return connection
+            self._discard(connection)
+
+    def release(self, connection):
+        """Вернуть соединение в пул или закрыть, если оно испорчено."""
+        try:
+            reusable = self.reset(connection)
+        except Exception:
+            reusable = False
+        if reusable:
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        else:
+            self._discard(connection)
+        self._slots.release()
+
+    def close(self):
+        """Закрыть простаивающие соединения."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    @staticmethod
+    def _is_healthy(connection):
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -0,0 +1,99 @@
+"""Бэкенд PostgreSQL с пулом соединений внутри процесса.
+
+Django 3.2 не умеет пул: соединение либо открывается на каждый запрос,
+либо (CONN_MAX_AGE) закрепляется за потоком. Здесь Django по-прежнему
+«открывает» и «закрывает» соединение на каждый запрос, но физические
+соединения берутся из общего для процесса ConnectionPool и
+возвращаются в него.
+
+Пул настраивается параметрами OPTIONS pool_size, pool_timeout (секунд
+ожидания свободного соединения) и pool_check_after (после скольких
+секунд простоя соединение проверяется перед выдачей).
+"""
+import threading
+
+import psycopg2.extensions
+import psycopg2.extras
+from django.db.backends.postgresql import base
+
+from ..pool import ConnectionPool
+
+POOL_OPTIONS = {"pool_size": 10, "pool_timeout": 30, "pool_check_after": 30}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _connect(conn_params):
+    connection = psycopg2.connect(**conn_params)
+    # То же, что делает бэкенд Django для нового соединения.
+    psycopg2.extras.register_default_jsonb(
+        conn_or_curs=connection, loads=lambda x: x
+    )
+    return connection
+
+
+def _reset(connection):
+    if connection.closed:
+        return False
+    idle = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    if connection.get_transaction_status() != idle:
+        connection.rollback()
+    return connection.get_transaction_status() == idle
+
+
+def get_pool(alias, conn_params, options):
+    """Пул соединений базы `alias`, общий для всех потоков процесса."""
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None:
+            settings = {
+                key: float(options.get(key, default))
+                for key, default in POOL_OPTIONS.items()
+            }
+            pool = _pools[alias] = ConnectionPool(
+                lambda: _connect(conn_params),
+                size=int(settings["pool_size"]),
+                timeout=settings["pool_timeout"],
+                check_after=settings["pool_check_after"],
+                reset=_reset,
+            )
+        return pool
+
+
+def close_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for key in POOL_OPTIONS:
+            params.pop(key, None)
+        return params
+
+    def _pool(self, conn_params=None):
+        if conn_params is None:
+            conn_params = self.get_connection_params()
+        return get_pool(self.alias, conn_params, self.settings_dict["OPTIONS"])
+
+    def get_new_connection(self, conn_params):
+        connection = self._pool(conn_params).acquire()
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool().release(self.connection)
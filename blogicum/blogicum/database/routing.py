@@ -0,0 +1,157 @@
+"""Чтение с реплик с гарантией «читаю свои записи».
+
+ReplicaRoutingMiddleware разрешает читать с реплик в GET- и
+HEAD-запросах. Запись всегда идёт в основную базу; после неё до конца
+запроса и ещё BLOG_REPLICA_LAG секунд (cookie) этот посетитель читает
+из основной базы, поэтому, например, после add_comment и перехода на
+страницу поста он видит свой комментарий, даже если реплика отстаёт.
+
+Вне запросов (команды, фоновые обработчики) реплики не используются.
+"""
+import asyncio
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "read_primary_until"
+SAFE_METHODS = ("GET", "HEAD")
+# Сессии меняются при каждом входе; устаревшая сессия на реплике
+# выглядела бы как выход из учётной записи.
+PRIMARY_ONLY_APPS = {"sessions"}
+# Как часто проверять отставание каждой реплики, секунд.
+LAG_CHECK_INTERVAL = 5
+
+_state = contextvars.ContextVar("replica_routing", default=None)
+_lag_checks = {}
+
+
+class RoutingState:
+    def __init__(self, use_replicas):
+        self.use_replicas = use_replicas
+        self.wrote = False
+
+
+def replica_lag(alias):
+    """Отставание реплики в секундах; None, если СУБД его не сообщает."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXTRACT(EPOCH FROM "
+            "now() - pg_last_xact_replay_timestamp())"
+        )
+        lag = cursor.fetchone()[0]
+    return float(lag) if lag is not None else None
+
+
+def _is_fresh(alias):
+    try:
+        lag = replica_lag(alias)
+    except Exception:
+        # Недоступная реплика пропускается до следующей проверки.
+        return False
+    return lag is None or lag <= settings.BLOG_REPLICA_LAG
+
+
+def available_replicas():
+    """Реплики, отставание которых не больше BLOG_REPLICA_LAG."""
+    now = time.monotonic()
+    available = []
+    for alias in settings.BLOG_READ_REPLICAS:
+        checked_at, fresh = _lag_checks.get(alias, (None, True))
+        if checked_at is None or now - checked_at > LAG_CHECK_INTERVAL:
+            fresh = _is_fresh(alias)
+            _lag_checks[alias] = (now, fresh)
+        if fresh:
+            available.append(alias)
+    return available
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or not state.use_replicas
+            or state.wrote
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+        ):
+            return DEFAULT_DB_ALIAS
+        replicas = available_replicas()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        # Явно: иначе объект, прочитанный с реплики, сохранился бы туда же.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # На репликах те же данные, что и в основной базе.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in settings.BLOG_READ_REPLICAS
+
+
+def _is_pinned(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Как у MiddlewareMixin: под ASGI цепочка остаётся асинхронной.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        state = self._start(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._finish(state, response)
+
+    async def __acall__(self, request):
+        state = self._start(request)
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._finish(state, response)
+
+    @staticmethod
+    def _start(request):
+        return RoutingState(
+            use_replicas=request.method in SAFE_METHODS
+            and not _is_pinned(request)
+        )
+
+    @staticmethod
+    def _finish(state, response):
+        lag = settings.BLOG_REPLICA_LAG
+        if state.wrote and settings.BLOG_READ_REPLICAS and lag > 0:
+            response.set_cookie(
+                PIN_COOKIE,
+                str(int(time.time() + lag) + 1),
+                max_age=lag + 1,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
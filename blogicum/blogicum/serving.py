@@ -0,0 +1,156 @@
+"""Отдача файлов с диска без внешнего веб-сервера.
+
+Файл целиком передаётся через FileResponse: WSGI-сервер с
+wsgi.file_wrapper отправляет его через sendfile, не копируя в память
+процесса. Поддерживаются запросы диапазонов (Range), условные запросы
+(If-Modified-Since) и заранее сжатые копии статики.
+"""
+
+import mimetypes
+import os
+import re
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+# Порядок — по предпочтению: brotli сжимает лучше gzip.
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def resolve(root, path):
+    """Полный путь к файлу `path` внутри `root` или Http404."""
+    try:
+        full_path = safe_join(root, path)
+    except SuspiciousFileOperation:
+        raise Http404("Файл не найден.")
+    # Скрытые файлы — незавершённые загрузки хранилища.
+    hidden = os.path.basename(full_path).startswith(".")
+    if hidden or not os.path.isfile(full_path):
+        raise Http404("Файл не найден.")
+    return full_path
+
+
+def parse_range(header, size):
+    """Вернуть (start, end) включительно или None, если Range игнорируется.
+
+    Несколько диапазонов сразу не поддерживаются: по RFC 9110 сервер
+    вправе ответить на такой запрос полным файлом.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        length = min(int(end), size)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return size - length, size - 1
+    start = int(start)
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(end), size - 1) if end else size - 1
+    if end < start:
+        return None
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _accepted_encoding(request, full_path):
+    accepted = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    for encoding, suffix in PRECOMPRESSED:
+        if encoding in accepted and os.path.isfile(full_path + suffix):
+            return encoding, full_path + suffix
+    return None, full_path
+
+
+def file_response(request, full_path, cache_control, precompressed=False):
+    """Ответ с содержимым `full_path`.
+
+    При `precompressed` вместо файла отдаётся его `.br`/`.gz`-копия, если
+    клиент её принимает; диапазоны для сжатых копий не поддерживаются.
+    """
+    encoding, served_path = None, full_path
+    if precompressed:
+        encoding, served_path = _accepted_encoding(request, full_path)
+
+    stat = os.stat(served_path)
+    last_modified = http_date(stat.st_mtime)
+    headers = {"Cache-Control": cache_control, "Last-Modified": last_modified}
+    if precompressed:
+        headers["Vary"] = "Accept-Encoding"
+
+    if not was_modified_since(
+        request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime, stat.st_size
+    ):
+        return _with_headers(HttpResponseNotModified(), headers)
+
+    content_type = (
+        mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    )
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    else:
+        headers["Accept-Ranges"] = "bytes"
+
+    range_header = request.META.get("HTTP_RANGE")
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if (
+        encoding is None
+        and range_header
+        and request.method == "GET"
+        and (if_range is None or if_range == last_modified)
+    ):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return _with_headers(response, headers)
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _read_range(served_path, start, length),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            response["Content-Length"] = str(length)
+            return _with_headers(response, headers)
+
+    response = FileResponse(open(served_path, "rb"), content_type=content_type)
+    response["Content-Length"] = str(stat.st_size)
+    return _with_headers(response, headers)
+
+
+def _with_headers(response, headers):
+    for header, value in headers.items():
+        response[header] = value
+    return response
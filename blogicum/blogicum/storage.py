@@ -0,0 +1,68 @@
+import gzip
+import posixpath
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {
+    ".css",
+    ".js",
+    ".map",
+    ".svg",
+    ".txt",
+    ".html",
+    ".json",
+    ".xml",
+    ".ico",
+}
+# Сжатая копия, которая экономит меньше 5 %, не стоит лишнего файла.
+MIN_COMPRESSION_RATIO = 0.95
+
+
+def _compressors():
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешем в имени и заранее сжатыми копиями.
+
+    После обычной обработки collectstatic рядом с каждым текстовым файлом
+    кладутся `.gz` и, если установлен пакет brotli, `.br`; их отдаёт
+    blogicum.views.serve_static, не сжимая ничего на лету.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        # Промежуточные имена из нескольких проходов уже удалены, поэтому
+        # сжимаются только исходные файлы и итоговые имена из манифеста.
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if not self.exists(name):
+                continue
+            for compressed_name in self._compress(name):
+                yield name, compressed_name, True
+
+    def _compress(self, name):
+        extension = posixpath.splitext(name)[1].lower()
+        if extension not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.open(name) as fh:
+            data = fh.read()
+        for suffix, compress in _compressors():
+            compressed = compress(data)
+            if len(compressed) >= len(data) * MIN_COMPRESSION_RATIO:
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            yield compressed_name
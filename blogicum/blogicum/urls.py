@@ -1,13 +1,14 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
 from blog.views import UserRegisterView, CustomLoginView
+from blogicum.views import serve_media, serve_static
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("blog.urls")),
+    path("api/", include("blog.api_urls")),
     path("pages/", include("pages.urls")),
     path(
         "auth/registration/", UserRegisterView.as_view(), name="registration"
@@ -20,7 +21,17 @@ handler403 = "blogicum.views.custom_permission_denied_view"
 handler404 = "blogicum.views.custom_page_not_found_view"
 handler500 = "blogicum.views.custom_server_error_view"
 
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )
+urlpatterns += [
+    re_path(
+        r"^%s(?P<path>.*)$" % settings.MEDIA_URL.lstrip("/"), serve_media
+    ),
+]
+
+# В режиме отладки статику отдаёт runserver прямо из STATICFILES_DIRS.
+if not settings.DEBUG:
+    urlpatterns += [
+        re_path(
+            r"^%s(?P<path>.*)$" % settings.STATIC_URL.lstrip("/"),
+            serve_static,
+        ),
+    ]
@@ -1,4 +1,17 @@
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
 from django.shortcuts import render
+from django.views.decorators.http import require_safe
+
+from blog.storage import IMMUTABLE_CACHE_CONTROL, ContentAddressedStorage
+
+from .serving import file_response, resolve
+
+# Файлы без хеша в имени могут измениться по тому же адресу.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Имена с хешем из манифеста статики: (id манифеста, размер) → множество.
+_hashed_static_names = {}
 
 
 def custom_permission_denied_view(request, exception):
@@ -11,3 +24,46 @@ def custom_page_not_found_view(request, exception):
 
 def custom_server_error_view(request):
     return render(request, "pages/500.html", status=500)
+
+
+@require_safe
+def serve_media(request, path):
+    """Отдать загруженный файл; хешированные имена кешируются навсегда."""
+    full_path = resolve(settings.MEDIA_ROOT, path)
+    if ContentAddressedStorage.is_hashed_name(path):
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        cache_control = REVALIDATE_CACHE_CONTROL
+    return file_response(request, full_path, cache_control)
+
+
+def _is_hashed_static(path):
+    """Есть ли `path` среди имён с хешем из манифеста статики.
+
+    Множество имён строится один раз, а не перебором манифеста на каждый
+    запрос. collectstatic дополняет манифест на месте, поэтому при смене
+    его размера множество строится заново.
+    """
+    hashed_files = getattr(staticfiles_storage, "hashed_files", {})
+    key = (id(hashed_files), len(hashed_files))
+    names = _hashed_static_names.get(key)
+    if names is None:
+        names = frozenset(hashed_files.values())
+        _hashed_static_names.clear()
+        _hashed_static_names[key] = names
+    return path in names
+
+
+@require_safe
+def serve_static(request, path):
+    """Отдать файл из STATIC_ROOT, собранный collectstatic.
+
+    Имена с хешем из манифеста кешируются навсегда; если клиент
+    принимает сжатие, отдаётся заранее сжатая копия.
+    """
+    full_path = resolve(settings.STATIC_ROOT, path)
+    if _is_hashed_static(path):
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        cache_control = REVALIDATE_CACHE_CONTROL
+    return file_response(request, full_path, cache_control, precompressed=True)
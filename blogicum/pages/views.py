@@ -1,5 +1,12 @@
 from django.views.generic import TemplateView
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
+
+from blog.page_cache import anonymous_page_cache
+
+cache_static_page = method_decorator(
+    anonymous_page_cache(tags=lambda: ["pages"]), name="dispatch"
+)
 
 
 def custom_page_not_found_view(request, exception):
@@ -14,9 +21,11 @@ def custom_server_error_view(request):
     return render(request, "pages/500.html", status=500)
 
 
+@cache_static_page
 class AboutView(TemplateView):
     template_name = "pages/about.html"
 
 
+@cache_static_page
 class RulesView(TemplateView):
     template_name = "pages/rules.html"
@@ -0,0 +1,15 @@
+// Фильтры админки с автодополнением (blog.admin_filters.AutocompleteFilter):
+// выбор значения сразу применяет фильтр. select2 сообщает о выборе
+// событием jQuery, поэтому обработчик вешается через django.jQuery.
+django.jQuery(function ($) {
+  $(".blog-autocomplete-filter").on("change", function () {
+    var base = this.dataset.queryString;
+    if (!this.value) {
+      window.location.search = base;
+      return;
+    }
+    var separator = base.length > 1 ? "&" : "";
+    window.location.search =
+      base + separator + this.dataset.lookup + "=" + encodeURIComponent(this.value);
+  });
+});
@@ -0,0 +1,40 @@
+// Подгрузка комментариев к посту порциями по курсору (blog:post_comments).
+// Без JavaScript кнопка остаётся обычной ссылкой на следующую страницу.
+document.addEventListener("DOMContentLoaded", function () {
+  var button = document.getElementById("load-more-comments");
+  var list = document.getElementById("comment-list");
+  if (!button || !list || !window.fetch) {
+    return;
+  }
+  button.addEventListener("click", function (event) {
+    event.preventDefault();
+    if (button.classList.contains("disabled")) {
+      return;
+    }
+    button.classList.add("disabled");
+    var url =
+      button.dataset.url + "?cursor=" + encodeURIComponent(button.dataset.cursor);
+    fetch(url, {
+      headers: { Accept: "application/json" },
+      credentials: "same-origin",
+    })
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.status);
+        }
+        return response.json();
+      })
+      .then(function (data) {
+        list.insertAdjacentHTML("beforeend", data.html);
+        if (data.next_cursor) {
+          button.dataset.cursor = data.next_cursor;
+          button.classList.remove("disabled");
+        } else {
+          button.parentNode.remove();
+        }
+      })
+      .catch(function () {
+        window.location.href = button.href;
+      });
+  });
+});
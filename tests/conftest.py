@@ -1,3 +1,4 @@
+import importlib
 import os
 import re
 import time
@@ -18,14 +19,19 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
 from django.contrib.auth import get_user_model
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.urls import clear_url_caches
 from mixer.backend.django import mixer as _mixer
 
+from blogicum.settings import blog_cache
+
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
@@ -41,6 +47,49 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True, scope="session")
+def process_local_caches():
+    """Кеши в памяти: тесты идут в одном процессе и не пишут файлы."""
+    with override_settings(
+        CACHES={
+            alias: blog_cache("locmem", alias, 10_000)
+            for alias in settings.CACHES
+        }
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    """Загруженные в тесте файлы — во временном каталоге, а не в media."""
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def async_views():
+    """Маршруты с асинхронными представлениями, как под ASGI."""
+    import blog.urls
+    import blogicum.urls
+
+    def reload_urls():
+        importlib.reload(blog.urls)
+        importlib.reload(blogicum.urls)
+        clear_url_caches()
+
+    with override_settings(BLOG_ASYNC_VIEWS=True):
+        reload_urls()
+        yield
+    reload_urls()
+
+
 class SafeImportFromContextManager:
     def __init__(
         self,
@@ -133,6 +182,16 @@ def another_user_client(another_user):
     return client
 
 
+def feed_urls(post):
+    """Страницы, на которых виден `post`: ленты и страница поста."""
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    ]
+
+
 def get_post_list_context_key(
     user_client, page_url, page_load_err_msg, key_missing_msg
 ):
@@ -371,6 +430,7 @@ def cleanup(request):
                 filename.endswith(".jpg")
                 or filename.endswith(".gif")
                 or filename.endswith(".png")
+                or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -100,6 +100,19 @@ def post_with_published_location(
     return post
 
 
+@pytest.fixture
+def feed_post(mixer: Mixer, user, published_location, published_category):
+    """Опубликованный вчера пост, видный во всех лентах."""
+    return mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        category=published_category,
+        location=published_location,
+    )
+
+
 @pytest.fixture
 def many_posts_with_published_locations(
     mixer: Mixer, user, published_locations, published_category
@@ -0,0 +1,236 @@
+import json
+import os
+import statistics
+import time
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.template.backends.django import Template
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+PERF_ENABLED = bool(os.environ.get("BLOGICUM_PERF"))
+UPDATE_BASELINE = bool(os.environ.get("BLOGICUM_PERF_UPDATE"))
+
+N_USERS = int(os.environ.get("BLOGICUM_PERF_USERS", 1_000))
+N_POSTS = int(os.environ.get("BLOGICUM_PERF_POSTS", 10_000))
+N_COMMENTS = int(os.environ.get("BLOGICUM_PERF_COMMENTS", 100_000))
+N_CATEGORIES = 20
+N_LOCATIONS = 50
+ROUNDS = int(os.environ.get("BLOGICUM_PERF_ROUNDS", 20))
+# Во сколько раз замер может превысить базовое значение.
+THRESHOLD = float(os.environ.get("BLOGICUM_PERF_THRESHOLD", 1.5))
+# Абсолютный допуск, чтобы шум в доли миллисекунды не считался регрессией.
+SLACK_MS = float(os.environ.get("BLOGICUM_PERF_SLACK_MS", 5))
+BATCH_SIZE = 2_000
+
+# У каждой СУБД свой baseline: baseline.json для SQLite,
+# baseline.postgresql.json для PostgreSQL (DATABASE_URL).
+BASELINE_PATH = Path(
+    os.environ.get(
+        "BLOGICUM_PERF_BASELINE",
+        Path(__file__).parent
+        / (
+            "baseline.json"
+            if connection.vendor == "sqlite"
+            else f"baseline.{connection.vendor}.json"
+        ),
+    )
+)
+TIMING_METRICS = ("sql_ms", "render_ms", "p50_ms", "p95_ms")
+
+
+class Dataset(NamedTuple):
+    author: object
+    author_client: Client
+    category: object
+    post: object
+    comment: object
+
+
+class ViewStats(NamedTuple):
+    queries: int
+    sql_ms: float
+    render_ms: float
+    p50_ms: float
+    p95_ms: float
+
+
+def seed_dataset(mixer: Mixer) -> Dataset:
+    """Заполнить базу пользователями, постами и комментариями пачками."""
+    User = get_user_model()
+    User.objects.bulk_create(
+        [User(username=f"perf_user_{i}") for i in range(N_USERS)],
+        batch_size=BATCH_SIZE,
+    )
+    users = list(User.objects.filter(username__startswith="perf_user_"))
+    categories = mixer.cycle(N_CATEGORIES).blend(
+        "blog.Category", is_published=True
+    )
+    locations = mixer.cycle(N_LOCATIONS).blend(
+        "blog.Location", is_published=True
+    )
+
+    start = timezone.now() - timedelta(days=N_POSTS)
+    text = "Текст публикации для нагрузочного теста. " * 20
+    Post.objects.bulk_create(
+        [
+            Post(
+                title=f"Публикация {i}",
+                text=text,
+                pub_date=start + timedelta(days=i),
+                author=users[i % len(users)],
+                category=categories[i % len(categories)],
+                location=locations[i % len(locations)],
+                is_published=True,
+            )
+            for i in range(N_POSTS)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    post_ids = list(Post.objects.values_list("id", flat=True))
+    Comment.objects.bulk_create(
+        [
+            Comment(
+                post_id=post_ids[i % len(post_ids)],
+                author=users[i % len(users)],
+                text=f"Комментарий {i}",
+            )
+            for i in range(N_COMMENTS)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    # bulk_create не отправляет сигналы: счётчики и лента пересчитываются
+    # разом.
+    call_command("recount_comments", stdout=StringIO())
+    call_command("rebuild_feed", "--full", stdout=StringIO())
+
+    # Самый свежий пост: он открывает ленту и получает свою долю комментариев.
+    post = Post.objects.select_related("author", "category").get(
+        pk=post_ids[-1]
+    )
+    comment = post.comments.filter(author=post.author).first()
+    if comment is None:
+        comment = Comment.objects.create(
+            post=post, author=post.author, text="Комментарий автора"
+        )
+    client = Client()
+    client.force_login(post.author)
+    return Dataset(
+        author=post.author,
+        author_client=client,
+        category=post.category,
+        post=post,
+        comment=comment,
+    )
+
+
+def clear_dataset():
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    get_user_model().objects.filter(username__startswith="perf_").delete()
+
+
+def _percentile(samples: List[float], percent: int) -> float:
+    ordered = sorted(samples)
+    index = max(0, round(percent / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def measure_view(client: Client, url: str, rounds: int = ROUNDS) -> ViewStats:
+    """Запросить `url` несколько раз и собрать замеры в миллисекундах.
+
+    Время SQL меряет execute_wrapper через perf_counter: время в
+    connection.queries округлено до миллисекунды, и быстрые запросы в нём
+    нулевые.
+    """
+    render_times: List[float] = []
+    sql_times: List[float] = []
+    original_render = Template.render
+
+    def timed_query(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            sql_times.append(time.perf_counter() - started)
+
+    def timed_render(self, *args, **kwargs):
+        # Ленивые QuerySet выполняются во время рендеринга, их время
+        # учитывается в sql_ms, а не в render_ms.
+        first_query = len(sql_times)
+        started = time.perf_counter()
+        try:
+            return original_render(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            lazy_sql = sum(sql_times[first_query:])
+            render_times.append(max(elapsed - lazy_sql, 0))
+
+    wall_times = []
+    queries = sql_time = 0
+    with mock.patch.object(
+        Template, "render", timed_render
+    ), connection.execute_wrapper(timed_query):
+        # Прогрев: первый запрос компилирует шаблоны и заполняет кеши.
+        response = client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+        render_times.clear()
+        for _ in range(rounds):
+            first_query = len(sql_times)
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                client.get(url)
+                wall_times.append(time.perf_counter() - started)
+            queries = len(ctx.captured_queries)
+            sql_time += sum(sql_times[first_query:])
+
+    return ViewStats(
+        queries=queries,
+        sql_ms=round(sql_time / rounds * 1000, 2),
+        render_ms=round(sum(render_times) / rounds * 1000, 2),
+        p50_ms=round(statistics.median(wall_times) * 1000, 2),
+        p95_ms=round(_percentile(wall_times, 95) * 1000, 2),
+    )
+
+
+def load_baseline() -> Dict[str, dict]:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_baseline(baseline: Dict[str, dict]):
+    with open(BASELINE_PATH, "w", encoding="utf-8") as fh:
+        json.dump(baseline, fh, indent=2, sort_keys=True, ensure_ascii=False)
+        fh.write("\n")
+
+
+def find_regressions(stats: ViewStats, expected: dict) -> List[str]:
+    """Сравнить замер с базовым значением; вернуть список регрессий."""
+    regressions = []
+    if stats.queries > expected.get("queries", stats.queries):
+        regressions.append(
+            f"queries: {stats.queries} > {expected['queries']}"
+        )
+    for metric in TIMING_METRICS:
+        limit = expected.get(metric)
+        if limit is None:
+            continue
+        value = getattr(stats, metric)
+        if value > limit * THRESHOLD + SLACK_MS:
+            regressions.append(
+                f"{metric}: {value} > {limit} * {THRESHOLD} + {SLACK_MS}"
+            )
+    return regressions
@@ -0,0 +1,169 @@
+"""Пропускная способность лент и страницы поста под WSGI и ASGI.
+
+WSGI-обработчик обслуживает запросы пулом из WSGI_THREADS потоков, как
+gunicorn с воркером gthread. ASGI-обработчик с асинхронными
+представлениями получает все CONCURRENCY запросов сразу в одном цикле
+событий, как uvicorn. Задержка сети до сервера базы (DB_LATENCY_MS на
+запрос) имитируется паузой, которая, как и настоящее ожидание сокета,
+отпускает GIL.
+
+Выигрыш ASGI зависит от того, сколько запрос ждёт базу. Со встроенной
+SQLite и тремя-четырьмя запросами на страницу время уходит на
+процессор, и ASGI уступает WSGI из-за переключений потоков (на одном
+ядре — около 80 и 57 запросов/с), поэтому асинхронные представления
+включаются только явно. Тест следит, чтобы отставание не превышало
+MAX_SLOWDOWN: без отдельных потоков запросов в blogicum.asgi синхронный код
+всех запросов выполнялся в одном потоке, и ASGI был медленнее WSGI в
+2,5 раза.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.db.backends.utils import CursorWrapper
+from django.test import RequestFactory, override_settings
+from mixer.backend.django import mixer as _mixer
+
+from blogicum.asgi import application
+from perf.harness import (
+    PERF_ENABLED,
+    clear_dataset,
+    seed_dataset,
+)
+
+pytestmark = pytest.mark.skipif(
+    not PERF_ENABLED,
+    reason="Замеры производительности включаются через BLOGICUM_PERF=1",
+)
+
+N_REQUESTS = int(os.environ.get("BLOGICUM_PERF_REQUESTS", 400))
+CONCURRENCY = int(os.environ.get("BLOGICUM_PERF_CONCURRENCY", 50))
+WSGI_THREADS = int(os.environ.get("BLOGICUM_PERF_WSGI_THREADS", 8))
+DB_LATENCY_MS = float(os.environ.get("BLOGICUM_PERF_DB_LATENCY_MS", 2))
+MAX_SLOWDOWN = 2
+
+
+@pytest.fixture(scope="module")
+def urls(django_db_setup, django_db_blocker):
+    # Без транзакции теста: потоки обработчиков должны видеть данные.
+    with django_db_blocker.unblock():
+        data = seed_dataset(_mixer)
+        yield [
+            "/",
+            f"/category/{data.category.slug}/",
+            f"/profile/{data.author.username}/",
+            f"/posts/{data.post.id}/",
+        ]
+        clear_dataset()
+
+
+@pytest.fixture
+def uncached_pages():
+    """Страницы собираются заново на каждый запрос."""
+    caches = dict(settings.CACHES)
+    caches[settings.BLOG_PAGE_CACHE_ALIAS] = {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+    }
+    with override_settings(CACHES=caches):
+        yield
+
+
+def _with_latency(method):
+    def execute(self, *args, **kwargs):
+        time.sleep(DB_LATENCY_MS / 1000)
+        return method(self, *args, **kwargs)
+
+    return execute
+
+
+def _wsgi_get(handler, path):
+    environ = RequestFactory().get(path).environ
+    statuses = []
+    response = handler(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    try:
+        b"".join(response)
+    finally:
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+def _run_wsgi(paths):
+    handler = WSGIHandler()
+    with ThreadPoolExecutor(WSGI_THREADS) as pool:
+        return list(pool.map(lambda path: _wsgi_get(handler, path), paths))
+
+
+async def _asgi_get(app, path):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def _run_asgi(paths):
+    connections = asyncio.Semaphore(CONCURRENCY)
+
+    async def get(path):
+        async with connections:
+            return await _asgi_get(application, path)
+
+    return await asyncio.gather(*(get(path) for path in paths))
+
+
+def _throughput(run, paths):
+    started = time.perf_counter()
+    statuses = run(paths)
+    elapsed = time.perf_counter() - started
+    assert set(statuses) == {200}, statuses
+    return len(paths) / elapsed
+
+
+def test_asgi_throughput(request, urls, uncached_pages, django_db_blocker):
+    paths = [urls[number % len(urls)] for number in range(N_REQUESTS)]
+    latency = mock.patch.object(
+        CursorWrapper, "execute", _with_latency(CursorWrapper.execute)
+    )
+    with django_db_blocker.unblock(), latency:
+        # Первый проход компилирует шаблоны и открывает соединения.
+        _throughput(_run_wsgi, urls)
+        wsgi = _throughput(_run_wsgi, paths)
+
+        request.getfixturevalue("async_views")
+        asyncio.run(_run_asgi(urls))
+        asgi = _throughput(lambda paths: asyncio.run(_run_asgi(paths)), paths)
+
+    print(
+        f"\nWSGI, {WSGI_THREADS} потоков: {wsgi:.0f} запросов/с; "
+        f"ASGI, {CONCURRENCY} соединений: {asgi:.0f} запросов/с"
+    )
+    assert asgi * MAX_SLOWDOWN >= wsgi, (
+        "Убедитесь, что под ASGI запросы не выстраиваются в очередь к "
+        "одному потоку: пропускная способность упала ниже WSGI более чем "
+        f"в {MAX_SLOWDOWN} раза."
+    )
@@ -0,0 +1,151 @@
+"""Чтение и запись комментариев в SQLite из нескольких потоков.
+
+Сравнивает настройки SQLite по умолчанию (журнал отката) с
+BLOG_SQLITE_PRAGMAS. В режиме журнала отката запись ждёт, пока читатели
+отпустят базу, а читатели ждут фиксации записи; в WAL они не мешают друг
+другу.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+from django.conf import settings
+
+from blog.db import apply_pragmas
+from perf.harness import PERF_ENABLED, _percentile
+
+pytestmark = pytest.mark.skipif(
+    not PERF_ENABLED,
+    reason="Замеры производительности включаются через BLOGICUM_PERF=1",
+)
+
+N_READERS = int(os.environ.get("BLOGICUM_PERF_READERS", 4))
+N_ROWS = int(os.environ.get("BLOGICUM_PERF_COMMENTS", 100_000))
+DURATION = float(os.environ.get("BLOGICUM_PERF_SECONDS", 3))
+
+
+def _connect(path, pragmas):
+    # Как и у Django, занятая база ждётся до 5 секунд.
+    db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+    apply_pragmas(db, pragmas)
+    return db
+
+
+def _seed(path, pragmas):
+    db = _connect(path, pragmas)
+    db.execute(
+        "CREATE TABLE blog_comment (id INTEGER PRIMARY KEY, "
+        "post_id INTEGER NOT NULL, text TEXT NOT NULL, created_at TEXT)"
+    )
+    db.execute("CREATE INDEX comment_post ON blog_comment (post_id, id)")
+    db.executemany(
+        "INSERT INTO blog_comment (post_id, text, created_at) "
+        "VALUES (?, ?, datetime('now'))",
+        ((number % 1000, "Комментарий " * 10) for number in range(N_ROWS)),
+    )
+    db.commit()
+    db.close()
+
+
+class Load:
+    """Общее состояние потоков нагрузки."""
+
+    def __init__(self, path, pragmas):
+        self.path = path
+        self.pragmas = pragmas
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.read_times = []
+        self.writes = 0
+        self.errors = 0
+
+    def failed(self):
+        with self.lock:
+            self.errors += 1
+
+
+def _read(load, number):
+    db = _connect(load.path, load.pragmas)
+    post_id = number
+    while not load.stop.is_set():
+        started = time.perf_counter()
+        try:
+            db.execute(
+                "SELECT COUNT(*) FROM blog_comment WHERE text != ''"
+            ).fetchone()
+            db.execute(
+                "SELECT id, text FROM blog_comment WHERE post_id = ? "
+                "ORDER BY id LIMIT 50",
+                [post_id % 1000],
+            ).fetchall()
+        except sqlite3.OperationalError:
+            load.failed()
+            continue
+        with load.lock:
+            load.read_times.append((time.perf_counter() - started) * 1000)
+        post_id += N_READERS
+    db.close()
+
+
+def _write(load):
+    db = _connect(load.path, load.pragmas)
+    while not load.stop.is_set():
+        try:
+            db.execute(
+                "INSERT INTO blog_comment (post_id, text, created_at) "
+                "VALUES (1, 'Новый', datetime('now'))"
+            )
+            db.commit()
+            load.writes += 1
+        except sqlite3.OperationalError:
+            db.rollback()
+            load.failed()
+    db.close()
+
+
+def _run(path, pragmas):
+    """Вернуть (p95 чтения в мс, записей в секунду, ошибок блокировки)."""
+    load = Load(path, pragmas)
+    threads = [
+        threading.Thread(target=_read, args=(load, number))
+        for number in range(N_READERS)
+    ]
+    threads.append(threading.Thread(target=_write, args=(load,)))
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    load.stop.set()
+    for thread in threads:
+        thread.join()
+    return (
+        _percentile(load.read_times, 95),
+        load.writes / DURATION,
+        load.errors,
+    )
+
+
+def test_reads_and_writes_do_not_block_each_other(tmp_path):
+    results = {}
+    for name, pragmas in (
+        ("default", {}),
+        ("tuned", settings.BLOG_SQLITE_PRAGMAS),
+    ):
+        path = tmp_path / f"{name}.sqlite3"
+        _seed(path, pragmas)
+        results[name] = _run(path, pragmas)
+        print(
+            "\n{}: чтение p95 {:.1f} мс, записей {:.0f}/с, "
+            "ошибок блокировки {}".format(name, *results[name])
+        )
+
+    default_p95, default_writes, _ = results["default"]
+    tuned_p95, tuned_writes, tuned_errors = results["tuned"]
+    assert tuned_errors == 0
+    assert (
+        tuned_writes > default_writes
+    ), "Убедитесь, что в WAL запись комментариев не ждёт читателей."
+    assert (
+        tuned_p95 <= default_p95 * 1.2
+    ), "Убедитесь, что в WAL чтение не ждёт записи."
@@ -0,0 +1,95 @@
+import os
+import tracemalloc
+from io import BytesIO
+
+import pytest
+from django.conf import settings
+from django.core.files.uploadhandler import load_handler
+from django.test.client import RequestFactory
+from PIL import Image
+
+from blog.forms import PostForm
+from blog.uploads import StreamingImageUploadHandler
+from perf.harness import PERF_ENABLED
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        not PERF_ENABLED,
+        reason="Замеры производительности включаются через BLOGICUM_PERF=1",
+    ),
+]
+
+# Меньше FILE_UPLOAD_MAX_MEMORY_SIZE: такие файлы стандартные обработчики
+# Django держат в памяти целиком.
+UPLOAD_SIZE = int(os.environ.get("BLOGICUM_PERF_UPLOAD_BYTES", 2_000_000))
+# Потоковый приём не должен занимать больше нескольких кусков.
+MAX_STREAMING_PEAK = 8 * StreamingImageUploadHandler.chunk_size
+
+
+def _noisy_jpeg(size):
+    """JPEG из шума: такой почти не сжимается и весит около `size`."""
+    side = 256
+    while True:
+        pixels = os.urandom(side * side * 3)
+        image = Image.frombytes("RGB", (side, side), pixels)
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", quality=95)
+        if buffer.tell() >= size:
+            return buffer.getvalue()
+        side += 128
+
+
+def _upload_request(content):
+    buffer = BytesIO(content)
+    buffer.name = "photo.jpg"
+    return RequestFactory().post(
+        "/posts/create/", data={"title": "Пост", "image": buffer}
+    )
+
+
+def _peak_memory(request):
+    """Пиковый прирост памяти Python на разбор запроса и проверку формы."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        form = PostForm(
+            request.POST,
+            files=request.FILES,
+            upload_errors=getattr(request, "upload_errors", None),
+        )
+        form.is_valid()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    for upload in request.FILES.values():
+        upload.close()
+    return peak - baseline
+
+
+def test_upload_peak_memory():
+    content = _noisy_jpeg(UPLOAD_SIZE)
+
+    default_request = _upload_request(content)
+    default_request.upload_handlers = [
+        load_handler(path, default_request)
+        for path in settings.FILE_UPLOAD_HANDLERS
+    ]
+    default_peak = _peak_memory(default_request)
+
+    streaming_request = _upload_request(content)
+    streaming_request.upload_handlers = [
+        StreamingImageUploadHandler(streaming_request)
+    ]
+    streaming_peak = _peak_memory(streaming_request)
+
+    print(
+        f"\nupload {len(content) / 1024:.0f} KiB: "
+        f"default handlers peak {default_peak / 1024:.0f} KiB, "
+        f"streaming handler peak {streaming_peak / 1024:.0f} KiB"
+    )
+    assert streaming_peak < MAX_STREAMING_PEAK, (
+        f"Потоковый приём занял {streaming_peak / 1024:.0f} KiB — файл "
+        "читается в память целиком."
+    )
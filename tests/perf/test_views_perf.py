@@ -0,0 +1,96 @@
+import pytest
+from mixer.backend.django import mixer as _mixer
+
+from perf.harness import (
+    PERF_ENABLED,
+    UPDATE_BASELINE,
+    Dataset,
+    clear_dataset,
+    find_regressions,
+    load_baseline,
+    measure_view,
+    save_baseline,
+    seed_dataset,
+)
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        not PERF_ENABLED,
+        reason="Замеры производительности включаются через BLOGICUM_PERF=1",
+    ),
+]
+
+VIEWS = {
+    "blog:index": lambda d: "/",
+    "blog:index:deep": lambda d: "/?page=500",
+    "blog:category_posts": lambda d: f"/category/{d.category.slug}/",
+    "blog:profile": lambda d: f"/profile/{d.author.username}/",
+    "blog:post_detail": lambda d: f"/posts/{d.post.id}/",
+    "blog:edit_post": lambda d: f"/posts/{d.post.id}/edit/",
+    "blog:delete_post": lambda d: f"/posts/{d.post.id}/delete/",
+    "blog:edit_comment": lambda d: (
+        f"/posts/{d.post.id}/edit_comment/{d.comment.id}/"
+    ),
+    "blog:delete_comment": lambda d: (
+        f"/posts/{d.post.id}/delete_comment/{d.comment.id}/"
+    ),
+    "api:posts": lambda d: "/api/posts/",
+    "api:category_posts": lambda d: (
+        f"/api/categories/{d.category.slug}/posts/"
+    ),
+    "api:profile_posts": lambda d: f"/api/profile/{d.author.username}/posts/",
+}
+# JSON API и HTML-лента с теми же постами.
+API_VS_HTML = {
+    "api:posts": "blog:index",
+    "api:category_posts": "blog:category_posts",
+    "api:profile_posts": "blog:profile",
+}
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker) -> Dataset:
+    with django_db_blocker.unblock():
+        data = seed_dataset(_mixer)
+        yield data
+        clear_dataset()
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    recorded = load_baseline()
+    yield recorded
+    if UPDATE_BASELINE:
+        save_baseline(recorded)
+
+
+@pytest.mark.parametrize("view_name", VIEWS)
+def test_view_performance(view_name, dataset, baseline):
+    url = VIEWS[view_name](dataset)
+    stats = measure_view(dataset.author_client, url)
+    print(f"\n{view_name}: {stats._asdict()}")
+
+    if UPDATE_BASELINE or view_name not in baseline:
+        baseline[view_name] = stats._asdict()
+        return
+
+    regressions = find_regressions(stats, baseline[view_name])
+    assert not regressions, (
+        f"Производительность `{view_name}` ({url}) ухудшилась относительно "
+        "базовых значений из `tests/perf/baseline.json`: "
+        + "; ".join(regressions)
+    )
+
+
+@pytest.mark.parametrize("api_view", API_VS_HTML)
+def test_api_is_cheaper_than_html(api_view, dataset):
+    html_view = API_VS_HTML[api_view]
+    api = measure_view(dataset.author_client, VIEWS[api_view](dataset))
+    html = measure_view(dataset.author_client, VIEWS[html_view](dataset))
+    print(
+        f"\n{api_view}: p50 {api.p50_ms} ms, {html_view}: p50 {html.p50_ms} ms"
+    )
+    assert api.p50_ms < html.p50_ms, (
+        f"`{api_view}` отвечает не быстрее HTML-ленты `{html_view}`."
+    )
@@ -0,0 +1,113 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.admin import PostAdmin
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELISTS = ["/admin/blog/post/", "/admin/blog/comment/"]
+
+
+def _make_rows(mixer, number):
+    posts = mixer.cycle(number).blend(
+        "blog.Post",
+        category__is_published=True,
+        location__is_published=True,
+    )
+    mixer.cycle(number).blend("blog.Comment", post=(p for p in posts))
+    return posts
+
+
+def _queries(client, url, **params):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params)
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize("url", CHANGELISTS)
+def test_changelist_queries_do_not_grow_with_rows(admin_client, mixer, url):
+    _make_rows(mixer, 2)
+    few = _queries(admin_client, url)
+    _make_rows(mixer, 12)
+    many = _queries(admin_client, url)
+    assert many == few, (
+        "Убедитесь, что список объектов в админке загружает связанные "
+        "объекты одним запросом, а не отдельным запросом на каждую строку."
+    )
+
+
+@pytest.mark.parametrize("url", CHANGELISTS)
+def test_changelist_does_not_scan_dates(admin_client, mixer, url):
+    _make_rows(mixer, 2)
+    with CaptureQueriesContext(connection) as ctx:
+        admin_client.get(url)
+    assert not [
+        query for query in ctx.captured_queries if "DISTINCT" in query["sql"]
+    ], (
+        "Убедитесь, что список в админке не строит навигацию по датам "
+        "(date_hierarchy): она перебирает даты всех строк таблицы."
+    )
+
+
+def test_author_filter_does_not_list_all_users(admin_client, mixer):
+    posts = _make_rows(mixer, 2)
+    idle = mixer.cycle(20).blend("auth.User")
+    content = admin_client.get("/admin/blog/post/").content.decode()
+    assert "blog-autocomplete-filter" in content
+    assert not any(
+        user.username in content for user in idle
+    ), "Убедитесь, что фильтр по автору не выводит всех пользователей."
+
+    author = posts[0].author
+    response = admin_client.get(
+        "/admin/blog/post/", {"author__id__exact": author.id}
+    )
+    assert list(response.context["cl"].result_list) == [posts[0]]
+    assert f'<option value="{author.id}" selected>' in (
+        response.content.decode()
+    )
+
+
+def test_autocomplete_filter_source(admin_client, mixer):
+    post = _make_rows(mixer, 1)[0]
+    response = admin_client.get(
+        "/admin/autocomplete/",
+        {
+            "app_label": "blog",
+            "model_name": "post",
+            "field_name": "author",
+            "term": post.author.username,
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"id": str(post.author.id), "text": post.author.username}
+    ]
+
+
+def test_changelist_shows_estimated_count(admin_client, mixer, settings):
+    settings.BLOG_EXACT_COUNT_LIMIT = 3
+    _make_rows(mixer, 5)
+    with CaptureQueriesContext(connection) as ctx:
+        content = admin_client.get("/admin/blog/post/").content.decode()
+    assert "около 5" in content
+    assert not any(
+        "COUNT(" in q["sql"] for q in ctx.captured_queries
+    ), "Убедитесь, что список постов без фильтров не выполняет COUNT(*)."
+
+
+@pytest.mark.parametrize("number", [50, 10**25])
+def test_changelist_page_past_estimate(
+    admin_client, mixer, settings, monkeypatch, number
+):
+    settings.BLOG_EXACT_COUNT_LIMIT = 3
+    monkeypatch.setattr(PostAdmin, "list_per_page", 2)
+    _make_rows(mixer, 5)
+    response = admin_client.get("/admin/blog/post/", {"p": number})
+    assert response.status_code == 302, (
+        "Убедитесь, что пустая страница списка постов за оценённой "
+        "границей не открывается."
+    )
+    assert response["Location"].endswith("?e=1")
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 7
+
+
+@pytest.fixture
+def feed(mixer, user, published_category):
+    now = timezone.now()
+    posts = [
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            is_published=True,
+            pub_date=now - timedelta(hours=number),
+            location__is_published=True,
+        )
+        for number in range(N_POSTS)
+    ]
+    hidden = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=False,
+        pub_date=now - timedelta(days=1),
+    )
+    return posts, hidden
+
+
+def _walk(client, url):
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        ids.extend(item["id"] for item in data["results"])
+        url = data["next"]
+    return ids
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/posts/",
+        "/api/categories/{category}/posts/",
+        "/api/profile/{author}/posts/",
+    ],
+)
+def test_feed_endpoints_walk_all_posts(client, feed, url):
+    posts, hidden = feed
+    url = url.format(
+        category=posts[0].category.slug, author=posts[0].author.username
+    )
+    ids = _walk(client, url + "?limit=3")
+    assert ids == [post.id for post in posts], (
+        "Убедитесь, что API отдаёт опубликованные посты от новых к старым "
+        "и переходит по страницам через `next`."
+    )
+    assert hidden.id not in ids
+
+
+def test_author_sees_own_hidden_posts(user_client, feed):
+    posts, hidden = feed
+    ids = _walk(user_client, f"/api/profile/{posts[0].author.username}/posts/")
+    assert hidden.id in ids
+
+
+def test_sparse_fields(client, feed):
+    posts, _ = feed
+    response = client.get("/api/posts/", {"fields": "id,title,category"})
+    item = response.json()["results"][0]
+    assert set(item) == {"id", "title", "category"}
+    assert item["category"]["slug"] == posts[0].category.slug
+
+    full = client.get("/api/posts/").json()["results"][0]
+    assert full["url"] == f"/posts/{posts[0].id}/"
+    assert full["author"] == posts[0].author.username
+    assert full["comment_count"] == 0
+
+
+def test_unknown_field_and_bad_cursor(client, feed):
+    assert (
+        client.get("/api/posts/", {"fields": "id,secret"}).status_code == 400
+    )
+    assert client.get("/api/posts/", {"cursor": "garbage"}).status_code == 400
+
+
+def test_etag_not_modified(client, feed):
+    etag = client.get("/api/posts/")["ETag"]
+    assert (
+        client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    )
+
+
+def test_api_queries(client, feed):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get("/api/posts/")
+    # Валидаторы ETag и одна выборка страницы.
+    assert len(ctx.captured_queries) <= 2
+
+
+def test_missing_category(client):
+    assert client.get("/api/categories/missing/posts/").status_code == 404
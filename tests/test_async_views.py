@@ -0,0 +1,145 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.urls import resolve
+
+from blogicum.asgi import application
+
+from blog.models import Comment
+from blog.page_cache import get_page_cache
+
+from conftest import feed_urls
+
+# Асинхронные представления читают базу из других потоков, которые не
+# видят данных незавершённой транзакции теста.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def _context(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, url
+    page = response.context.get("page_obj") or response.context["comments"]
+    return [obj.id for obj in page], response.templates[0].name
+
+
+def test_async_views_are_routed(async_views, feed_post):
+    for url in feed_urls(feed_post):
+        assert asyncio.iscoroutinefunction(resolve(url).func), (
+            f"Убедитесь, что при BLOG_ASYNC_VIEWS страница {url} "
+            "обслуживается асинхронным представлением."
+        )
+        view = resolve(url).func
+        while hasattr(view, "__wrapped__"):
+            view = view.__wrapped__
+            assert asyncio.iscoroutinefunction(view), (
+                "Убедитесь, что декораторы асинхронных представлений "
+                "ожидают представление в цикле событий, а не выполняют "
+                "его в потоке."
+            )
+
+
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_async_pages_match_sync(request, client_name, mixer, feed_post):
+    client = request.getfixturevalue(client_name)
+    mixer.cycle(3).blend(Comment, post=feed_post)
+    expected = {url: _context(client, url) for url in feed_urls(feed_post)}
+
+    get_page_cache().clear()
+    request.getfixturevalue("async_views")
+    for url, context in expected.items():
+        assert _context(client, url) == context, (
+            f"Убедитесь, что асинхронная страница {url} показывает то же, "
+            "что и синхронная."
+        )
+
+
+@override_settings(BLOG_COMMENTS_PER_PAGE=2)
+def test_async_comment_pages(async_views, mixer, client, feed_post):
+    comments = mixer.cycle(5).blend(Comment, post=feed_post)
+    url = f"/posts/{feed_post.id}/"
+    for number, expected in [
+        ("2", comments[2:4]),
+        ("100", comments[4:]),
+        (str(10**25), comments[4:]),
+        ("abc", comments[:2]),
+    ]:
+        response = client.get(url, {"comments_page": number})
+        assert [c.id for c in response.context["comments"]] == [
+            c.id for c in expected
+        ], (
+            "Убедитесь, что асинхронная страница поста показывает ту же "
+            f"страницу обсуждения, что и синхронная (comments_page={number})."
+        )
+
+
+def test_async_views_not_found(async_views, mixer, client, feed_post):
+    feed_post.is_published = False
+    feed_post.save()
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    for url in [
+        f"/posts/{feed_post.id}/",
+        f"/category/{hidden_category.slug}/",
+        "/profile/no_such_user/",
+    ]:
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND, url
+
+
+def test_async_views_keep_caching(async_views, client, feed_post):
+    for url in feed_urls(feed_post):
+        response = client.get(url)
+        repeat = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert repeat.status_code == HTTPStatus.NOT_MODIFIED, url
+    assert client.get("/")["X-Page-Cache"] == "HIT"
+
+
+async def _asgi_get(path):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]["status"]
+
+
+@override_settings(BLOG_ASGI_THREADS=2)
+def test_asgi_reuses_connections(settings, feed_post):
+    opened = []
+
+    def count(sender, connection, **kwargs):
+        opened.append(connection)
+
+    async def run(paths):
+        return await asyncio.gather(*(_asgi_get(path) for path in paths))
+
+    connection_created.connect(count)
+    try:
+        for _ in range(5):
+            get_page_cache().clear()
+            statuses = asyncio.run(run(["/", f"/posts/{feed_post.id}/"]))
+            assert statuses == [HTTPStatus.OK, HTTPStatus.OK]
+    finally:
+        connection_created.disconnect(count)
+    assert 0 < len(opened) <= settings.BLOG_ASGI_THREADS, (
+        "Убедитесь, что под ASGI потоки запросов и их соединения с базой "
+        "переиспользуются, а не открываются заново на каждый запрос."
+    )
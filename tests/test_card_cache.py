@@ -0,0 +1,44 @@
+import pytest
+
+from blog.card_cache import card_cache_stats
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _index(client):
+    return client.get("/").content.decode("utf-8")
+
+
+def test_cards_are_served_from_cache(user_client, feed_post):
+    _index(user_client)
+    hits_before = card_cache_stats()["hits"]
+    _index(user_client)
+    assert card_cache_stats()["hits"] == hits_before + 1, (
+        "Убедитесь, что повторный показ ленты берёт карточку поста из кеша."
+    )
+
+
+def test_card_cache_invalidation(mixer, user_client, feed_post):
+    _index(user_client)
+
+    feed_post.title = "Новый заголовок поста"
+    feed_post.save()
+    assert "Новый заголовок поста" in _index(user_client)
+
+    feed_post.category.title = "Переименованная категория"
+    feed_post.category.save()
+    assert "Переименованная категория" in _index(user_client)
+
+    feed_post.location.name = "Переименованное место"
+    feed_post.location.save()
+    assert "Переименованное место" in _index(user_client)
+
+    comment = mixer.blend(Comment, post=feed_post)
+    assert "Комментарии (1)" in _index(user_client)
+    comment.delete()
+    assert "Комментарии (0)" in _index(user_client)
+
+    feed_post.author.username = "renamed_author"
+    feed_post.author.save()
+    assert "@renamed_author" in _index(user_client)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+from bs4 import BeautifulSoup
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+PER_PAGE = 10
+N_COMMENTS = 25
+
+
+@pytest.fixture
+def discussed_post(mixer, settings):
+    settings.BLOG_COMMENTS_PER_PAGE = PER_PAGE
+    post = mixer.blend(
+        "blog.Post",
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        category__is_published=True,
+        location__is_published=True,
+    )
+    start = timezone.now() - timedelta(hours=1)
+    comments = mixer.cycle(N_COMMENTS).blend("blog.Comment", post=post)
+    # Часть комментариев — в одну секунду: курсор различает их по id.
+    for number, comment in enumerate(comments):
+        comment.created_at = start + timedelta(seconds=number // 3)
+        comment.save(update_fields=["created_at"])
+    post.refresh_from_db()
+    return post
+
+
+def test_detail_renders_first_comments_only(client, discussed_post):
+    response = client.get(f"/posts/{discussed_post.id}/")
+    soup = BeautifulSoup(response.content.decode("utf-8"), "html.parser")
+    rendered = soup.select("#comment-list .media")
+    assert len(rendered) == PER_PAGE, (
+        "Убедитесь, что на странице поста сразу выводится только первая "
+        "порция комментариев."
+    )
+    button = soup.find(id="load-more-comments")
+    assert button is not None and button["data-cursor"]
+
+
+def test_load_more_walks_whole_thread(client, discussed_post):
+    first = BeautifulSoup(
+        client.get(f"/posts/{discussed_post.id}/").content, "html.parser"
+    )
+    cursor = first.find(id="load-more-comments")["data-cursor"]
+    url = f"/posts/{discussed_post.id}/comments/"
+
+    loaded = []
+    while cursor:
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url, {"cursor": cursor})
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        # Сессия не нужна анониму: пост с авторами и порция комментариев.
+        assert len(ctx.captured_queries) <= 3
+        data = response.json()
+        assert data["html"].count('class="media mb-4"') == len(
+            data["comments"]
+        )
+        loaded.extend(data["comments"])
+        cursor = data["next_cursor"]
+
+    expected = list(
+        discussed_post.comments.order_by("created_at", "id").values_list(
+            "id", flat=True
+        )
+    )
+    assert [c["id"] for c in loaded] == expected[PER_PAGE:]
+
+
+def test_first_portion_without_cursor(client, discussed_post):
+    data = client.get(f"/posts/{discussed_post.id}/comments/").json()
+    assert len(data["comments"]) == PER_PAGE
+    assert data["next_cursor"]
+
+
+def test_bad_cursor(client, discussed_post):
+    response = client.get(
+        f"/posts/{discussed_post.id}/comments/", {"cursor": "garbage"}
+    )
+    assert response.status_code == 400
+
+
+def test_hidden_post_comments(client, discussed_post):
+    discussed_post.is_published = False
+    discussed_post.save()
+    response = client.get(f"/posts/{discussed_post.id}/comments/")
+    assert response.status_code == 404
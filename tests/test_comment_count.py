@@ -0,0 +1,50 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _stored_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(Comment, post=post)
+    assert _stored_count(post) == 3, (
+        "Убедитесь, что счётчик комментариев поста увеличивается при "
+        "добавлении комментария."
+    )
+    comments[0].delete()
+    assert _stored_count(post) == 2, (
+        "Убедитесь, что счётчик комментариев поста уменьшается при "
+        "удалении комментария."
+    )
+    Comment.objects.filter(pk=comments[1].pk).delete()
+    assert _stored_count(post) == 1
+
+
+def test_comment_count_survives_author_cascade(
+    mixer, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(Comment, post=post)
+    mixer.cycle(2).blend(Comment, post=post, author=another_user)
+    another_user.delete()
+    assert _stored_count(post) == 1
+
+
+def test_recount_comments_fixes_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend(Comment, post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=10)
+    out = StringIO()
+    call_command("recount_comments", stdout=out)
+    assert _stored_count(post) == 2
+    assert "1" in out.getvalue()
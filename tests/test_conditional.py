@@ -0,0 +1,107 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.checks import check_shared_caches
+from blog.models import Comment
+from blog.page_cache import CACHE_HEADER
+from blogicum.settings import blog_cache
+
+from conftest import feed_urls
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_repeat_request_gets_not_modified(request, client_name, feed_post):
+    client = request.getfixturevalue(client_name)
+    for url in feed_urls(feed_post):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header("ETag")
+        assert response.has_header("Last-Modified")
+        repeat = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert repeat.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что страница {url} отвечает 304 Not Modified, "
+            "если содержимое не менялось."
+        )
+
+
+def test_etag_changes_with_comments(mixer, user_client, feed_post):
+    etags = {url: user_client.get(url)["ETag"] for url in feed_urls(feed_post)}
+    comment = mixer.blend(Comment, post=feed_post)
+    for url, etag in etags.items():
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что после нового комментария страница {url} "
+            "отдаётся заново."
+        )
+
+    etag = user_client.get(f"/posts/{feed_post.id}/")["ETag"]
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    response = user_client.get(
+        f"/posts/{feed_post.id}/", HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_etag_differs_between_users(client, user_client, feed_post):
+    assert client.get("/")["ETag"] != user_client.get("/")["ETag"]
+
+
+def test_scheduled_publication_changes_etag(
+    client, mixer, user, published_category, feed_post, monkeypatch
+):
+    publish_at = timezone.now() + timedelta(minutes=1)
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        pub_date=publish_at,
+        category=published_category,
+    )
+    etag = client.get("/")["ETag"]
+
+    later = publish_at + timedelta(seconds=1)
+    monkeypatch.setattr("blog.models.now", lambda: later)
+    monkeypatch.setattr("django.utils.timezone.now", lambda: later)
+    response = client.get("/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что с наступлением отложенной публикации лента "
+        "отдаётся заново, а не отвечает 304 Not Modified."
+    )
+
+
+def test_feed_validators_do_not_scan_posts(client, feed_post):
+    client.get("/")
+    with CaptureQueriesContext(connection) as context:
+        response = client.get("/")
+    assert response[CACHE_HEADER] == "HIT"
+    assert len(context.captured_queries) == 1, (
+        "Убедитесь, что страница ленты из кеша стоит одного запроса — "
+        "проверки ETag."
+    )
+    sql = context.captured_queries[0]["sql"]
+    assert "blog_feedentry" in sql and "blog_post" not in sql, (
+        "Убедитесь, что ETag ленты вычисляется по записям FeedEntry, а "
+        "не агрегатом по всем постам."
+    )
+
+
+def test_process_local_tag_versions_are_reported(settings, tmp_path):
+    settings.DEBUG = False
+    warnings = {warning.msg for warning in check_shared_caches(None)}
+    assert any(settings.BLOG_PAGE_CACHE_ALIAS in msg for msg in warnings), (
+        "Убедитесь, что manage.py check предупреждает, если версии тегов, "
+        "из которых строятся ETag, хранятся в памяти процесса."
+    )
+
+    settings.CACHES = {
+        alias: blog_cache("file", alias, 100) for alias in settings.CACHES
+    }
+    assert check_shared_caches(None) == []
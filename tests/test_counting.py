@@ -0,0 +1,162 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import counting, feed
+from blog.models import Comment, Post
+from blog.page_cache import invalidate_tags
+from blog.pagination import EstimatedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(7).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
+@pytest.fixture
+def exact_limit(settings):
+    settings.BLOG_EXACT_COUNT_LIMIT = 4
+
+
+def _count_queries(ctx):
+    return sum("COUNT(" in query["sql"] for query in ctx.captured_queries)
+
+
+def test_table_size_follows_inserts_and_deletes(mixer, posts):
+    assert counting.table_size(Post) == 7
+    Post.objects.bulk_create(
+        [
+            Post(
+                title="Пакетом",
+                text="Текст",
+                author=posts[0].author,
+                category=posts[0].category,
+                pub_date=timezone.now(),
+            )
+            for _ in range(3)
+        ]
+    )
+    assert counting.table_size(Post) == 10
+    Post.objects.filter(title="Пакетом").delete()
+    posts[0].delete()
+    assert counting.table_size(Post) == 6
+
+    mixer.cycle(2).blend("blog.Comment", post=posts[1])
+    assert counting.table_size(Comment) == 2
+
+
+def test_small_counts_are_exact(posts):
+    assert counting.count(Post.objects.all()) == (7, True)
+    assert counting.count(Post.objects.published()) == (7, True)
+
+
+def test_whole_table_uses_table_size(posts, exact_limit):
+    with CaptureQueriesContext(connection) as ctx:
+        assert counting.count(Post.objects.all()) == (7, False)
+    assert (
+        _count_queries(ctx) == 0
+    ), "Убедитесь, что размер большой таблицы берётся без COUNT(*)."
+
+
+def test_filtered_count_is_cached(posts, exact_limit, published_category):
+    slug = published_category.slug
+    assert counting.count(feed.category_entries(slug), ["feed"]) == (7, False)
+
+    # Новая выборка — новое «сейчас» в фильтре, но то же закешированное
+    # число и тот же признак точности.
+    with CaptureQueriesContext(connection) as ctx:
+        assert counting.count(feed.category_entries(slug), ["feed"]) == (
+            7,
+            False,
+        )
+    assert _count_queries(ctx) == 0
+
+    posts[0].delete()
+    assert counting.count(feed.category_entries(slug), ["feed"]) == (6, False)
+
+
+def test_feed_uses_listed_counter(posts, exact_limit):
+    with CaptureQueriesContext(connection) as ctx:
+        assert counting.count(feed.entries()) == (7, False)
+    assert (
+        _count_queries(ctx) == 0
+    ), "Убедитесь, что размер общей ленты берётся из счётчика TableSize."
+
+    posts[0].delete()
+    posts[1].is_published = False
+    posts[1].save()
+    assert counting.stored_size(feed.LISTED_COUNTER) == 5
+    posts[2].category.is_published = False
+    posts[2].category.save()
+    assert counting.stored_size(feed.LISTED_COUNTER) == 0
+    assert counting.count(feed.entries()) == (0, True)
+
+
+def test_estimated_paginator_opens_pages_past_estimate(posts, exact_limit):
+    queryset = Post.objects.order_by("id")
+    paginator = EstimatedCountPaginator(queryset, 2)
+    posts[-1].delete()
+    posts[-2].delete()
+    # Счётчик таблицы отстаёт не бывает, поэтому занижаем оценку вручную.
+    paginator.count = 3
+    paginator.count_is_exact = False
+    assert paginator.num_pages == 2
+    assert (
+        len(paginator.page(3)) == 1
+    ), "Убедитесь, что страницы за оценённой границей открываются."
+    assert list(paginator.get_elided_page_range(1, on_each_side=1)) == [
+        1,
+        2,
+        paginator.ELLIPSIS,
+    ]
+
+
+@pytest.mark.parametrize("number", [5, 10**25])
+def test_estimated_paginator_rejects_empty_pages(posts, exact_limit, number):
+    paginator = EstimatedCountPaginator(Post.objects.order_by("id"), 2)
+    paginator.count = 3
+    paginator.count_is_exact = False
+    with pytest.raises(EmptyPage):
+        paginator.page(number)
+    assert paginator.get_page(number).number == paginator.num_pages, (
+        "Убедитесь, что пустая страница за оценённой границей не "
+        "открывается, а get_page переходит к последней странице."
+    )
+
+
+@pytest.mark.parametrize("number", [50, 10**25])
+def test_feed_page_past_estimate(client, posts, exact_limit, number):
+    client.get("/")
+    response = client.get("/", {"page": number})
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["page_obj"]) > 0, (
+        "Убедитесь, что номер страницы за оценённой границей ленты не "
+        "открывает пустую страницу."
+    )
+
+
+def test_feed_shows_many_pages(user_client, mixer, user, exact_limit):
+    mixer.cycle(25).blend(
+        "blog.Post",
+        author=user,
+        category__is_published=True,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    for _ in range(2):
+        content = user_client.get("/").content.decode()
+        assert "Страниц много" in content
+        assert "Последняя" not in content
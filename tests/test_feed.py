@@ -0,0 +1,144 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import feed
+from blog.models import FeedEntry, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _feed_ids(**filters):
+    return list(feed.entries(**filters).values_list("id", flat=True))
+
+
+def test_entry_follows_post(mixer, feed_post, published_category):
+    entry = FeedEntry.objects.get(pk=feed_post.pk)
+    assert (entry.category_id, entry.author_id, entry.pub_date) == (
+        published_category.pk,
+        feed_post.author_id,
+        feed_post.pub_date,
+    ), "Убедитесь, что у нового поста появляется запись в ленте."
+
+    feed_post.is_published = False
+    feed_post.save()
+    assert (
+        _feed_ids() == []
+    ), "Убедитесь, что скрытый пост пропадает из материализованной ленты."
+    assert _feed_ids(published=False, author_id=feed_post.author_id) == [
+        feed_post.pk
+    ]
+
+    feed_post.delete()
+    assert (
+        not FeedEntry.objects.exists()
+    ), "Убедитесь, что запись ленты удаляется вместе с постом."
+
+
+def test_entry_follows_category(mixer, feed_post, published_category):
+    published_category.is_published = False
+    published_category.save()
+    assert (
+        _feed_ids() == []
+    ), "Убедитесь, что посты скрытой категории пропадают из ленты."
+    published_category.is_published = True
+    published_category.save()
+    assert _feed_ids(category_id=published_category.pk) == [feed_post.pk]
+
+    published_category.delete()
+    assert _feed_ids() == []
+    assert FeedEntry.objects.get(pk=feed_post.pk).category_id is None
+
+
+def test_scheduled_post_enters_feed_on_time(
+    mixer, user, published_category, feed_post, monkeypatch
+):
+    publish_at = timezone.now() + timedelta(minutes=5)
+    scheduled = mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        pub_date=publish_at,
+        category=published_category,
+    )
+    assert _feed_ids() == [feed_post.pk]
+
+    later = publish_at + timedelta(seconds=1)
+    monkeypatch.setattr("django.utils.timezone.now", lambda: later)
+    assert _feed_ids() == [scheduled.pk, feed_post.pk], (
+        "Убедитесь, что отложенный пост попадает в ленту, когда наступает "
+        "время публикации."
+    )
+
+
+def test_feed_pages_read_feed_table(client, feed_post):
+    urls = [
+        "/",
+        f"/category/{feed_post.category.slug}/",
+        f"/profile/{feed_post.author.username}/",
+    ]
+    for url in urls:
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert list(response.context["page_obj"]) == [feed_post]
+        assert any("blog_feedentry" in q["sql"] for q in ctx), (
+            f"Убедитесь, что страница {url} выбирает посты по "
+            "материализованной ленте."
+        )
+
+
+def test_rebuild_feed_fixes_drift(mixer, user, published_category, feed_post):
+    Post.objects.bulk_create(
+        [
+            Post(
+                title="Пакетом",
+                text="Текст",
+                author=user,
+                category=published_category,
+                pub_date=timezone.now() - timedelta(hours=1),
+            )
+        ]
+    )
+    Post.objects.filter(pk=feed_post.pk).update(is_published=False)
+    FeedEntry.objects.create(
+        id=10_000,
+        author_id=user.pk,
+        pub_date=timezone.now(),
+        is_published=True,
+        category_is_published=True,
+    )
+
+    out = StringIO()
+    call_command("rebuild_feed", "--dry-run", stdout=out)
+    assert "3" in out.getvalue(), (
+        "Убедитесь, что rebuild_feed --dry-run находит пост без записи, "
+        "устаревшую запись и запись удалённого поста."
+    )
+    assert len(feed.drift()) == 3
+
+    call_command("rebuild_feed", stdout=StringIO())
+    assert feed.drift() == []
+    assert _feed_ids() == list(
+        Post.objects.published()
+        .order_by("-pub_date", "-id")
+        .values_list("id", flat=True)
+    )
+
+
+def test_full_rebuild(mixer, user, published_category, feed_post):
+    mixer.cycle(3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    FeedEntry.objects.all().delete()
+    out = StringIO()
+    call_command("rebuild_feed", "--full", stdout=out)
+    assert "4" in out.getvalue()
+    assert feed.drift() == []
@@ -0,0 +1,170 @@
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import image_storage, variant_names
+from blog.jobs import MAX_ATTEMPTS, schedule_image_processing
+from blog.models import ImageStatus, Post
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def _jpeg(size=(1600, 900), exif=False):
+    buffer = BytesIO()
+    image = Image.new("RGB", size, color=(73, 109, 137))
+    if exif:
+        metadata = Image.Exif()
+        metadata[0x010F] = "Camera maker"
+        image.save(buffer, "JPEG", exif=metadata)
+    else:
+        image.save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def process_queue(django_capture_on_commit_callbacks):
+    # Файлы без ссылок удаляются после фиксации транзакции.
+    def process():
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command(
+                "process_image_jobs",
+                once=True,
+                workers=1,
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+    return process
+
+
+def _create_post(client, category):
+    return client.post(
+        "/posts/create/",
+        data={
+            "title": "Пост с картинкой",
+            "text": "Текст",
+            "category": category.id,
+            "is_published": True,
+            "pub_date": (timezone.now() - timedelta(hours=1)).strftime(
+                "%Y-%m-%dT%H:%M"
+            ),
+            "image": SimpleUploadedFile(
+                "photo.jpg", _jpeg(exif=True), content_type="image/jpeg"
+            ),
+        },
+    )
+
+
+def test_upload_is_processed_by_worker(
+    user_client, published_category, process_queue
+):
+    _create_post(user_client, published_category)
+    post = Post.objects.get(title="Пост с картинкой")
+    assert post.image_status == ImageStatus.PENDING, (
+        "Убедитесь, что изображение обрабатывается вне запроса: после "
+        "создания поста оно должно стоять в очереди."
+    )
+    assert post.image_variants == {}
+    uploaded_name = post.image.name
+
+    process_queue()
+    post.refresh_from_db()
+    assert post.image_status == ImageStatus.READY
+    storage = image_storage()
+    assert not storage.exists(uploaded_name)
+    with storage.open(post.image.name) as fh:
+        assert not Image.open(fh).getexif(), "EXIF должен быть удалён."
+
+    variants = post.image_variants
+    assert (variants["width"], variants["height"]) == (1600, 900)
+    assert [w for w, _ in variants["sources"]["webp"]] == [
+        320,
+        640,
+        1280,
+        1600,
+    ]
+    assert [w for w, _ in variants["sources"]["jpeg"]] == [320, 640, 1280]
+    for name in variant_names(variants):
+        assert storage.exists(name)
+    with storage.open(variants["sources"]["jpeg"][0][1]) as fh:
+        assert Image.open(fh).size == (320, 180)
+
+    html = user_client.get("/").content.decode("utf-8")
+    img = BeautifulSoup(html, "html.parser").find("img", srcset=True)
+    assert (
+        img is not None
+    ), "Убедитесь, что в ленте у изображения поста указан атрибут srcset."
+    assert img["width"] == "1600" and img["height"] == "900"
+    assert img["loading"] == "lazy"
+    assert "image/webp" in html
+
+
+def test_failed_job_is_retried_then_marked(
+    post_with_published_location, process_queue
+):
+    post = post_with_published_location
+    job = schedule_image_processing(post)
+    image_storage().delete(post.image.name)
+    process_queue()
+    job.refresh_from_db()
+    post.refresh_from_db()
+    assert job.status == ImageStatus.FAILED
+    assert job.attempts == MAX_ATTEMPTS
+    assert post.image_status == ImageStatus.FAILED
+
+
+def test_replacing_image_removes_old_variants(
+    user_client,
+    published_category,
+    process_queue,
+    django_capture_on_commit_callbacks,
+):
+    _create_post(user_client, published_category)
+    process_queue()
+    post = Post.objects.get(title="Пост с картинкой")
+    old_names = variant_names(post.image_variants)
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(
+            f"/posts/{post.id}/edit/",
+            data={
+                "title": post.title,
+                "text": post.text,
+                "category": published_category.id,
+                "is_published": True,
+                "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+                "image": SimpleUploadedFile(
+                    "other.jpg", _jpeg((800, 800)), content_type="image/jpeg"
+                ),
+            },
+        )
+    post.refresh_from_db()
+    assert post.image_variants == {}
+    page = BeautifulSoup(
+        user_client.get(f"/posts/{post.id}/").content, "html.parser"
+    )
+    assert page.find("img", src=post.image.url) is not None
+    assert not page.select("img[srcset], source"), (
+        "Убедитесь, что до обработки нового изображения страница поста "
+        "не показывает варианты прежнего."
+    )
+
+    process_queue()
+    post.refresh_from_db()
+    assert post.image_variants["width"] == 800
+    storage = image_storage()
+    assert not any(storage.exists(name) for name in old_names)
+
+
+def test_backfill_command(post_with_published_location):
+    post = post_with_published_location
+    assert post.image_variants == {}
+    call_command("generate_image_variants", workers=2, stdout=StringIO())
+    post.refresh_from_db()
+    assert post.image_variants["width"] == 100
+    assert [w for w, _ in post.image_variants["sources"]["webp"]] == [100]
@@ -0,0 +1,73 @@
+import re
+
+import pytest
+from django.db import connection
+
+from blog import feed
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+FEED_TABLES = ("blog_post", "blog_comment", "blog_feedentry")
+PAGE = slice(20, 30)
+# Запрос, который сортирует только строки одной страницы.
+SORTS_PAGE = {"посты страницы ленты"}
+
+
+def _feed_querysets(category_id, author_id, post_id):
+    # Ленты строятся так же, как в представлениях: срез записей
+    # FeedEntry и посты страницы по id.
+    return {
+        "главная страница": feed.entries()[PAGE],
+        "страница категории": feed.entries(category_id=category_id)[PAGE],
+        "страница пользователя": feed.entries(
+            published=False, author_id=author_id
+        )[PAGE],
+        "посты страницы ленты": feed.page_posts(feed.entries()[PAGE]),
+        "комментарии к посту": (
+            Comment.objects.filter(post_id=post_id).order_by("created_at")[
+                PAGE
+            ]
+        ),
+    }
+
+
+def _full_scans(plan, sorts_page=False):
+    if connection.vendor == "postgresql":
+        return [
+            table
+            for table in FEED_TABLES
+            if re.search(rf"Seq Scan on {table}\b", plan)
+        ]
+    # SQLite: «SCAN blog_post» без индекса означает чтение всей таблицы,
+    # а временное B-дерево — сортировку всех подходящих строк.
+    if "TEMP B-TREE" in plan and not sorts_page:
+        return ["ORDER BY"]
+    return [
+        table
+        for table in FEED_TABLES
+        for line in plan.splitlines()
+        if re.search(rf"\bSCAN {table}\b", line) and "INDEX" not in line
+    ]
+
+
+@pytest.mark.skipif(
+    connection.vendor not in ("sqlite", "postgresql"),
+    reason="Планы запросов проверяются для SQLite и PostgreSQL",
+)
+def test_feed_queries_use_indexes(post_with_published_location):
+    post = post_with_published_location
+    querysets = _feed_querysets(post.category_id, post.author_id, post.id)
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # На крошечной тестовой таблице планировщик предпочёл бы
+            # последовательное чтение, поэтому запрещаем его явно.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+    for page_name, queryset in querysets.items():
+        plan = queryset.explain()
+        scans = _full_scans(plan, sorts_page=page_name in SORTS_PAGE)
+        assert not scans, (
+            f"Убедитесь, что запрос для «{page_name}» использует индекс, а "
+            f"не полный просмотр или сортировку: {', '.join(scans)}. "
+            f"План:\n{plan}"
+        )
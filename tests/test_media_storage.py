@@ -0,0 +1,134 @@
+import os
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test.client import RequestFactory
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import image_storage
+from blog.models import MediaFile, Post
+from blog.storage import IMMUTABLE_CACHE_CONTROL
+from blogicum.views import serve_media
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def _jpeg(color=(73, 109, 137)):
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), color=color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _create_post(client, category, content, title="Пост"):
+    client.post(
+        "/posts/create/",
+        data={
+            "title": title,
+            "text": "Текст",
+            "category": category.id,
+            "is_published": True,
+            "pub_date": (timezone.now() - timedelta(hours=1)).strftime(
+                "%Y-%m-%dT%H:%M"
+            ),
+            "image": SimpleUploadedFile(
+                "photo.jpg", content, content_type="image/jpeg"
+            ),
+        },
+    )
+    return Post.objects.get(title=title)
+
+
+def _refs(name):
+    return (
+        MediaFile.objects.filter(name=name)
+        .values_list("refs", flat=True)
+        .first()
+    )
+
+
+def test_identical_uploads_are_stored_once(user_client, published_category):
+    content = _jpeg()
+    first = _create_post(user_client, published_category, content, "Первый")
+    second = _create_post(user_client, published_category, content, "Второй")
+    assert (
+        first.image.name == second.image.name
+    ), "Убедитесь, что одинаковые изображения хранятся в одном файле."
+    name = first.image.name
+    assert name.startswith("posts/") and name.endswith(".jpg")
+    directory = os.path.dirname(image_storage().path(name))
+    assert len(os.listdir(directory)) == 1
+    assert _refs(name) == 2
+
+
+def test_file_is_deleted_with_last_reference(
+    user_client, published_category, django_capture_on_commit_callbacks
+):
+    content = _jpeg()
+    first = _create_post(user_client, published_category, content, "Первый")
+    second = _create_post(user_client, published_category, content, "Второй")
+    name = first.image.name
+    storage = image_storage()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f"/posts/{first.id}/delete/")
+    assert storage.exists(
+        name
+    ), "Файл, которым пользуется другой пост, не должен удаляться."
+    assert _refs(name) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f"/posts/{second.id}/delete/")
+    assert not storage.exists(name)
+    assert _refs(name) is None
+
+
+def test_replaced_image_is_released(
+    user_client, published_category, django_capture_on_commit_callbacks
+):
+    post = _create_post(user_client, published_category, _jpeg())
+    old_name = post.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(
+            f"/posts/{post.id}/edit/",
+            data={
+                "title": post.title,
+                "text": post.text,
+                "category": published_category.id,
+                "is_published": True,
+                "pub_date": post.pub_date.strftime("%Y-%m-%dT%H:%M"),
+                "image": SimpleUploadedFile(
+                    "other.jpg",
+                    _jpeg(color=(200, 10, 10)),
+                    content_type="image/jpeg",
+                ),
+            },
+        )
+    post.refresh_from_db()
+    assert post.image.name != old_name
+    assert not image_storage().exists(old_name)
+    assert _refs(post.image.name) == 1
+
+
+def test_delete_orphan_media(user_client, published_category):
+    post = _create_post(user_client, published_category, _jpeg())
+    storage = image_storage()
+    orphan = storage.save("posts/lost.jpg", BytesIO(_jpeg((1, 2, 3))))
+    old = time.time() - 2 * 60 * 60
+    for name in (orphan, post.image.name):
+        os.utime(storage.path(name), (old, old))
+
+    call_command("delete_orphan_media", stdout=StringIO())
+    assert not storage.exists(orphan)
+    assert storage.exists(post.image.name)
+
+
+def test_hashed_media_is_cached_forever(user_client, published_category):
+    post = _create_post(user_client, published_category, _jpeg())
+    request = RequestFactory().get(f"/media/{post.image.name}")
+    response = serve_media(request, post.image.name)
+    assert response["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+from blog.models import Comment
+from blog.page_cache import CACHE_HEADER
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/",
+        "/?page=1",
+        "/category/{post.category.slug}/",
+        "/posts/{post.id}/",
+        "/pages/about/",
+        "/pages/rules/",
+    ],
+)
+def test_anonymous_pages_are_cached(client, feed_post, url):
+    url = url.format(post=feed_post)
+    assert client.get(url)[CACHE_HEADER] == "MISS"
+    assert client.get(url)[CACHE_HEADER] == "HIT", (
+        f"Убедитесь, что страница {url} для анонимного посетителя "
+        "отдаётся из кеша при повторном запросе."
+    )
+
+
+def test_logged_in_users_bypass_cache(user_client, feed_post):
+    for _ in range(2):
+        response = user_client.get(f"/posts/{feed_post.id}/")
+        assert CACHE_HEADER not in response
+
+
+def test_content_changes_invalidate_pages(mixer, client, feed_post):
+    detail_url = f"/posts/{feed_post.id}/"
+    client.get("/")
+    client.get(detail_url)
+
+    feed_post.title = "Обновлённый заголовок"
+    feed_post.save()
+    assert "Обновлённый заголовок" in client.get("/").content.decode()
+
+    mixer.blend(Comment, post=feed_post, text="Свежий комментарий")
+    assert "Свежий комментарий" in client.get(detail_url).content.decode()
+
+
+def test_login_keeps_cached_pages(client, another_user, feed_post):
+    client.get("/")
+    Client().force_login(another_user)
+    assert client.get("/")[CACHE_HEADER] == "HIT", (
+        "Убедитесь, что вход пользователя в систему не сбрасывает "
+        "страничный кеш."
+    )
+
+    feed_post.author.username = "renamed_author"
+    feed_post.author.save()
+    response = client.get("/")
+    assert "renamed_author" in response.content.decode(), (
+        "Убедитесь, что смена имени автора обновляет страницы в кеше."
+    )
+
+
+def test_scheduled_post_appears_without_waiting_for_ttl(
+    client, mixer, user, published_category, feed_post, monkeypatch
+):
+    publish_at = timezone.now() + timedelta(minutes=1)
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        pub_date=publish_at,
+        category=published_category,
+        title="Отложенная публикация",
+    )
+    assert "Отложенная публикация" not in client.get("/").content.decode()
+
+    later = publish_at + timedelta(seconds=1)
+    monkeypatch.setattr("blog.models.now", lambda: later)
+    monkeypatch.setattr("django.utils.timezone.now", lambda: later)
+    response = client.get("/")
+    assert response[CACHE_HEADER] == "MISS"
+    assert "Отложенная публикация" in response.content.decode()
@@ -0,0 +1,122 @@
+import base64
+import json
+import re
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = N_PER_PAGE * 3 + 4
+
+
+@pytest.fixture
+def many_published_posts(mixer, user, published_category):
+    # Одинаковые даты у соседних постов проверяют второй ключ сортировки.
+    base = timezone.now() - timedelta(days=1)
+    dates = (base - timedelta(hours=i // 2) for i in range(N_POSTS))
+    return mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        pub_date=dates,
+        category=published_category,
+    )
+
+
+def _walk(client, link_re):
+    seen = []
+    url = "/"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        seen.append([post.id for post in response.context["page_obj"]])
+        match = re.search(link_re, response.content.decode("utf-8"))
+        url = "/" + match.group(1) if match else None
+    return seen
+
+
+@override_settings(BLOG_FEED_PAGINATION="cursor")
+def test_cursor_pagination_visits_every_post_once(
+    user_client, many_published_posts
+):
+    pages = _walk(user_client, r'href="(\?cursor=[\w-]+)">\s*>>')
+    ids = [post_id for page in pages for post_id in page]
+    expected = sorted(
+        many_published_posts, key=lambda p: (p.pub_date, p.id), reverse=True
+    )
+    assert ids == [post.id for post in expected], (
+        "Убедитесь, что при курсорной пагинации каждый пост ленты выводится "
+        "ровно один раз и в порядке убывания даты публикации."
+    )
+    assert all(len(page) == N_PER_PAGE for page in pages[:-1])
+
+
+@override_settings(BLOG_FEED_PAGINATION="cursor")
+def test_cursor_pagination_goes_back(user_client, many_published_posts):
+    first = user_client.get("/")
+    next_url = re.search(
+        r'href="(\?cursor=[\w-]+)">\s*>>', first.content.decode("utf-8")
+    ).group(1)
+    second = user_client.get("/" + next_url)
+    previous_url = re.search(
+        r'href="(\?cursor=[\w-]+)">\s*<<', second.content.decode("utf-8")
+    ).group(1)
+    back = user_client.get("/" + previous_url)
+    assert [p.id for p in back.context["page_obj"]] == [
+        p.id for p in first.context["page_obj"]
+    ]
+
+
+def test_broken_cursor_opens_first_page(user_client, many_published_posts):
+    response = user_client.get("/?cursor=not-a-cursor")
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"d": "2020-01-01T00:00:00+00:00", "i": 10**30},
+        {"d": "2020-01-01T00:00:00+00:00", "i": 0},
+        {"d": "2020-01-01T00:00:00", "i": 1},
+    ],
+)
+def test_forged_cursor_opens_first_page(
+    user_client, many_published_posts, payload
+):
+    token = (
+        base64.urlsafe_b64encode(json.dumps(payload).encode())
+        .decode()
+        .rstrip("=")
+    )
+    response = user_client.get("/", {"cursor": token})
+    assert response.status_code == 200, (
+        "Убедитесь, что курсор с id вне диапазона целых чисел базы или с "
+        "датой без часового пояса считается битым и открывает первую "
+        "страницу ленты."
+    )
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+
+
+def test_offset_navigator_is_windowed(
+    user_client, mixer, user, published_category
+):
+    mixer.cycle(N_PER_PAGE * 40).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        category=published_category,
+    )
+    content = user_client.get("/?page=20").content.decode("utf-8")
+    page_links = set(re.findall(r'href="\?page=(\d+)"', content))
+    assert len(page_links) < 12, (
+        "Убедитесь, что навигация по страницам показывает только соседние "
+        "номера страниц, а не ссылку на каждую страницу."
+    )
+    assert {"1", "19", "21", "40"} <= page_links
@@ -0,0 +1,147 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+# Сессия, пользователь, категория/профиль, COUNT(*) и страница постов.
+MAX_QUERIES_PER_FEED_PAGE = 6
+
+
+@pytest.fixture
+def posts_of_different_authors(mixer):
+    return mixer.cycle(N_PER_PAGE * 2).blend(
+        "blog.Post",
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        category__is_published=True,
+        location__is_published=True,
+    )
+
+
+@pytest.fixture
+def posts_in_one_category(mixer, published_category):
+    return mixer.cycle(N_PER_PAGE * 2).blend(
+        "blog.Post",
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        category=published_category,
+        location__is_published=True,
+    )
+
+
+@pytest.fixture
+def posts_of_one_author(mixer, user):
+    return mixer.cycle(N_PER_PAGE * 2).blend(
+        "blog.Post",
+        author=user,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        category__is_published=True,
+        location__is_published=True,
+    )
+
+
+def _assert_feed_queries_bounded(client, url, page_name):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+    assert len(ctx.captured_queries) <= MAX_QUERIES_PER_FEED_PAGE, (
+        f"Убедитесь, что {page_name} загружается не более чем за "
+        f"{MAX_QUERIES_PER_FEED_PAGE} запросов к базе данных, независимо "
+        "от числа постов на странице. Сейчас выполняется "
+        f"{len(ctx.captured_queries)} запросов."
+    )
+
+
+def test_index_queries(user_client, posts_of_different_authors):
+    _assert_feed_queries_bounded(user_client, "/", "главная страница")
+
+
+def test_category_queries(
+    user_client, published_category, posts_in_one_category
+):
+    _assert_feed_queries_bounded(
+        user_client,
+        f"/category/{published_category.slug}/",
+        "страница категории",
+    )
+
+
+def test_profile_queries(user_client, user, posts_of_one_author):
+    _assert_feed_queries_bounded(
+        user_client,
+        f"/profile/{user.username}/",
+        "страница пользователя",
+    )
+    _assert_feed_queries_bounded(
+        user_client,
+        f"/profile/{user.username}/?page=2",
+        "вторая страница пользователя",
+    )
+
+
+# Сессия, пользователь, пост и страница комментариев с авторами.
+MAX_QUERIES_PER_POST_PAGE = 5
+# Для страниц правки и удаления — ещё подсчёт номера страницы.
+MAX_QUERIES_PER_COMMENT_PAGE = 6
+
+
+@pytest.fixture
+def discussed_post(mixer, user, settings):
+    settings.BLOG_COMMENTS_PER_PAGE = 10
+    post = mixer.blend(
+        "blog.Post",
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        category__is_published=True,
+        location__is_published=True,
+    )
+    # Комментарии разных авторов: по одному запросу на автора быть не должно.
+    mixer.cycle(25).blend("blog.Comment", post=post)
+    mixer.blend("blog.Comment", post=post, author=user)
+    post.refresh_from_db()
+    return post
+
+
+def test_post_detail_queries(user_client, discussed_post):
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get(f"/posts/{discussed_post.id}/")
+    assert response.status_code == 200
+    assert len(response.context["comments"]) == 10
+    assert len(ctx.captured_queries) <= MAX_QUERIES_PER_POST_PAGE, (
+        "Убедитесь, что комментарии загружаются вместе с авторами: страница "
+        f"поста выполняет {len(ctx.captured_queries)} запросов."
+    )
+
+
+def test_comments_are_paginated(user_client, discussed_post):
+    last_page = user_client.get(
+        f"/posts/{discussed_post.id}/?comments_page=3"
+    ).context["comments"]
+    assert last_page.paginator.num_pages == 3
+    assert len(last_page) == 6
+    created = [comment.created_at for comment in last_page]
+    assert created == sorted(created)
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_page_queries(user_client, user, discussed_post, action):
+    comment = discussed_post.comments.get(author=user)
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get(
+            f"/posts/{discussed_post.id}/{action}/{comment.id}/"
+        )
+    assert response.status_code == 200
+    page = response.context["comments"]
+    assert comment in page, (
+        "Убедитесь, что при правке комментария показывается страница "
+        "обсуждения, на которой он находится."
+    )
+    assert len(ctx.captured_queries) <= MAX_QUERIES_PER_COMMENT_PAGE
@@ -0,0 +1,95 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections
+
+from blog.models import Category, Comment, FeedEntry, Location, Post
+from blogicum.database import routing
+
+pytestmark = [pytest.mark.django_db]
+
+REPLICA = "replica"
+REPLICATED = (
+    get_user_model(),
+    Category,
+    Location,
+    Post,
+    Comment,
+    FeedEntry,
+)
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """Вторая база SQLite в файле, которая изображает реплику."""
+    connections.databases[REPLICA] = {
+        **connections["default"].settings_dict,
+        "NAME": str(tmp_path / "replica.sqlite3"),
+    }
+    call_command("migrate", database=REPLICA, verbosity=0)
+    settings.BLOG_READ_REPLICAS = [REPLICA]
+    routing._lag_checks.clear()
+    yield REPLICA
+    connections[REPLICA].close()
+    del connections[REPLICA]
+    del connections.databases[REPLICA]
+
+
+def replicate():
+    """Догнать основную базу: скопировать её строки в реплику."""
+    for model in REPLICATED:
+        model.objects.using(REPLICA).all().delete()
+        model.objects.using(REPLICA).bulk_create(
+            model.objects.using("default").all()
+        )
+
+
+def test_reads_go_to_replica(client, feed_post, replica):
+    assert (
+        client.get(f"/posts/{feed_post.id}/").status_code == 404
+    ), "Убедитесь, что страницы только для чтения читают с реплики."
+    replicate()
+    assert client.get(f"/posts/{feed_post.id}/").status_code == 200
+
+
+def test_writer_reads_own_writes(user_client, client, feed_post, replica):
+    replicate()
+    response = user_client.post(
+        f"/posts/{feed_post.id}/comment/", {"text": "Свежий комментарий"}
+    )
+    assert response.status_code == 302
+    assert routing.PIN_COOKIE in response.cookies
+    assert Comment.objects.using("default").count() == 1
+
+    own = user_client.get(f"/posts/{feed_post.id}/").content.decode()
+    assert (
+        "Свежий комментарий" in own
+    ), "Убедитесь, что после записи посетитель читает из основной базы."
+    other = client.get(f"/posts/{feed_post.id}/").content.decode()
+    assert "Свежий комментарий" not in other
+
+
+def test_stickiness_expires(user_client, feed_post, replica, settings):
+    replicate()
+    settings.BLOG_REPLICA_LAG = 1
+    user_client.post(f"/posts/{feed_post.id}/comment/", {"text": "Позже"})
+    user_client.cookies[routing.PIN_COOKIE] = "0"
+    content = user_client.get(f"/posts/{feed_post.id}/").content.decode()
+    assert "Позже" not in content
+
+
+def test_writes_go_to_primary_without_replicas(
+    user_client, feed_post, settings
+):
+    settings.BLOG_READ_REPLICAS = []
+    response = user_client.post(
+        f"/posts/{feed_post.id}/comment/", {"text": "Без реплик"}
+    )
+    assert routing.PIN_COOKIE not in response.cookies
+
+
+def test_router_outside_requests(replica):
+    router = routing.ReplicaRouter()
+    assert router.db_for_read(Post) == "default"
+    assert router.db_for_write(Post) == "default"
+    assert not router.allow_migrate(REPLICA, "blog")
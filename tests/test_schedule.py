@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import schedule
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def scheduled_posts(
+    mixer, user, another_user, published_category, another_category
+):
+    soon = timezone.now() + timedelta(hours=1)
+    later = timezone.now() + timedelta(hours=5)
+    mixer.blend(
+        "blog.Post",
+        is_published=True,
+        pub_date=soon,
+        category=published_category,
+        author=user,
+    )
+    mixer.blend(
+        "blog.Post",
+        is_published=True,
+        pub_date=later,
+        category=another_category,
+        author=another_user,
+    )
+    return soon, later
+
+
+def test_next_publication_per_feed(
+    scheduled_posts, published_category, another_category, another_user
+):
+    soon, later = scheduled_posts
+    assert schedule.next_publication() == soon
+    assert schedule.next_publication(category=published_category.slug) == soon
+    assert schedule.next_publication(category=another_category.slug) == later
+    assert schedule.next_publication(author=another_user.username) == later
+
+
+def test_next_publication_ignores_hidden_posts(
+    mixer, user, published_category
+):
+    mixer.blend(
+        "blog.Post",
+        is_published=False,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+        author=user,
+    )
+    assert schedule.next_publication() is None
+
+
+def test_next_publication_is_refreshed_on_post_changes(
+    mixer, user, published_category, scheduled_posts
+):
+    assert schedule.next_publication() == scheduled_posts[0]
+    sooner = timezone.now() + timedelta(minutes=10)
+    mixer.blend(
+        "blog.Post",
+        is_published=True,
+        pub_date=sooner,
+        category=published_category,
+        author=user,
+    )
+    assert schedule.next_publication() == sooner
+
+
+def test_feed_expires_at_is_capped_by_timeout(scheduled_posts):
+    soon, _ = scheduled_posts
+    assert schedule.feed_expires_at(24 * 60 * 60) == soon
+    assert schedule.feed_expires_at(60) < soon
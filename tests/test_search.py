@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Comment
+from blog.search import filter_matching, query_terms, search
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, text="", **kwargs):
+        kwargs.setdefault("is_published", True)
+        kwargs.setdefault("pub_date", timezone.now() - timedelta(hours=1))
+        return mixer.blend(
+            "blog.Post",
+            title=title,
+            text=text,
+            author=user,
+            category=published_category,
+            **kwargs,
+        )
+
+    return make
+
+
+def _found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    page_obj = response.context["page_obj"]
+    return [post.id for post in page_obj]
+
+
+def test_query_terms_are_stemmed():
+    assert query_terms("Котами КОТАМИ кот") == ["кот"]
+    assert query_terms("running dogs") == ["run", "dog"]
+    assert query_terms("  ,,, ") == []
+
+
+def test_search_matches_word_forms(client, make_post):
+    cat = make_post("Мой кот", "Спит весь день.")
+    kittens = make_post("Про котов", "Рассказ о кошачьих повадках.")
+    make_post("Собака", "Лает на почтальона.")
+    assert set(_found(client, "котами")) == {
+        cat.id,
+        kittens.id,
+    }, "Убедитесь, что поиск находит посты по другим формам слова."
+
+
+def test_title_ranks_above_text(client, make_post):
+    in_text = make_post("Заметки", "Сегодня читал про вулканы.")
+    in_title = make_post("Вулканы Камчатки", "Путевые заметки.")
+    assert _found(client, "вулкан") == [
+        in_title.id,
+        in_text.id,
+    ], "Убедитесь, что совпадение в заголовке важнее совпадения в тексте."
+
+
+def test_search_hides_unpublished_posts(client, make_post):
+    visible = make_post("Весна пришла")
+    make_post("Весна скрыта", is_published=False)
+    make_post("Весна в будущем", pub_date=timezone.now() + timedelta(days=1))
+    assert _found(client, "весна") == [visible.id]
+
+
+def test_results_are_highlighted_and_escaped(client, make_post):
+    make_post("<b>Грозы</b> летом", "Гроза & молния <script>")
+    content = client.get("/search/", {"q": "гроза"}).content.decode()
+    assert "<mark>Грозы</mark>" in content
+    assert "<mark>Гроза</mark> &amp; молния &lt;script&gt;" in content
+    assert "<script>" not in content
+
+
+def test_index_follows_post_changes(make_post):
+    post = make_post("Океан", "Большая вода.")
+    assert [hit[0] for hit in search("океан")] == [post.id]
+
+    post.title = "Море"
+    post.save()
+    assert search("океан") == []
+    assert [hit[0] for hit in search("море")] == [post.id]
+
+    post.delete()
+    assert search("море") == []
+
+
+def test_empty_query_shows_only_form(client):
+    response = client.get("/search/", {"q": "  "})
+    assert response.status_code == 200
+    assert response.context["page_obj"] is None
+
+
+def test_search_pages_keep_query(client, make_post):
+    for number in range(12):
+        make_post(f"Облако {number}")
+    response = client.get("/search/", {"q": "облака"})
+    page_obj = response.context["page_obj"]
+    assert len(page_obj) == 10 and page_obj.has_next()
+    assert "?q=%D0%BE%D0%B1%D0%BB%D0%B0%D0%BA%D0%B0&page=2" in (
+        response.content.decode()
+    )
+    second = client.get("/search/", {"q": "облака", "page": 2})
+    assert len(second.context["page_obj"]) == 2
+
+
+def test_admin_uses_search_index(admin_client, make_post):
+    post = make_post("Горные реки", "Сплав по порогам.")
+    make_post("Равнины", "Степь.")
+    response = admin_client.get("/admin/blog/post/", {"q": "река"})
+    assert response.status_code == 200
+    assert [obj.id for obj in response.context["cl"].result_list] == [post.id]
+
+
+@override_settings(BLOG_SEARCH_MAX_RESULTS=2)
+def test_admin_search_is_not_capped(admin_client, make_post):
+    posts = [make_post(f"Водопад {number}") for number in range(3)]
+    response = admin_client.get("/admin/blog/post/", {"q": "водопады"})
+    assert {obj.id for obj in response.context["cl"].result_list} == {
+        post.id for post in posts
+    }, (
+        "Убедитесь, что поиск в админке показывает все найденные посты, "
+        "а не первые BLOG_SEARCH_MAX_RESULTS."
+    )
+
+
+def test_comment_index_follows_changes(mixer, make_post):
+    post = make_post("Пост")
+    comment = mixer.blend(Comment, post=post, text="Отличные фотографии.")
+    assert list(filter_matching(Comment.objects.all(), "фотография")) == [
+        comment
+    ]
+
+    comment.text = "Спасибо за рассказ."
+    comment.save()
+    assert not filter_matching(Comment.objects.all(), "фотография").exists()
+    assert filter_matching(Comment.objects.all(), "рассказы").exists()
+
+    comment.delete()
+    assert not filter_matching(Comment.objects.all(), "рассказ").exists()
+
+
+def test_admin_searches_comments_by_index(
+    admin_client, mixer, user, make_post
+):
+    post = make_post("Пост")
+    found = mixer.blend(Comment, post=post, text="Красивый закат.")
+    mixer.blend(Comment, post=post, text="Дождливый день.")
+    by_author = mixer.blend(
+        Comment, post=post, author=user, text="Без ключевых слов."
+    )
+
+    response = admin_client.get("/admin/blog/comment/", {"q": "закаты"})
+    assert response.status_code == 200
+    assert [obj.id for obj in response.context["cl"].result_list] == [
+        found.id
+    ], "Убедитесь, что поиск комментариев в админке идёт по индексу текста."
+
+    response = admin_client.get("/admin/blog/comment/", {"q": user.username})
+    assert by_author.id in {
+        obj.id for obj in response.context["cl"].result_list
+    }, "Убедитесь, что в админке комментарии ищутся и по имени автора."
@@ -0,0 +1,124 @@
+import gzip
+from io import StringIO
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test.client import RequestFactory
+from django.utils.http import http_date
+
+from blog.storage import IMMUTABLE_CACHE_CONTROL
+from blogicum.views import REVALIDATE_CACHE_CONTROL, serve_static
+
+CONTENT = bytes(range(256)) * 40
+HASHED_NAME = "posts/ab/cd/abcd" + "0" * 60 + ".jpg"
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    path = tmp_path / HASHED_NAME
+    path.parent.mkdir(parents=True)
+    path.write_bytes(CONTENT)
+    return path
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+def test_media_is_served_without_debug(client, media_file):
+    response = client.get(f"/media/{HASHED_NAME}")
+    assert (
+        response.status_code == 200
+    ), "Убедитесь, что загруженные файлы отдаются и без DEBUG."
+    assert _body(response) == CONTENT
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+
+
+@pytest.mark.parametrize(
+    "header, start, end",
+    [
+        ("bytes=0-99", 0, 99),
+        ("bytes=10000-", 10000, len(CONTENT) - 1),
+        ("bytes=-16", len(CONTENT) - 16, len(CONTENT) - 1),
+        ("bytes=100-999999", 100, len(CONTENT) - 1),
+    ],
+)
+def test_media_range_requests(client, media_file, header, start, end):
+    response = client.get(f"/media/{HASHED_NAME}", HTTP_RANGE=header)
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+    assert _body(response) == CONTENT[start : end + 1]
+
+
+def test_unsatisfiable_range(client, media_file):
+    response = client.get(
+        f"/media/{HASHED_NAME}", HTTP_RANGE=f"bytes={len(CONTENT)}-"
+    )
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_media_not_modified(client, media_file):
+    response = client.get(
+        f"/media/{HASHED_NAME}",
+        HTTP_IF_MODIFIED_SINCE=http_date(media_file.stat().st_mtime),
+    )
+    assert response.status_code == 304
+
+
+def test_media_path_traversal(client, media_file):
+    assert client.get("/media/../settings.py").status_code == 404
+    assert client.get("/media/posts/missing.jpg").status_code == 404
+
+
+def test_collectstatic_precompresses_hashed_files(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    settings.STATICFILES_STORAGE = (
+        "blogicum.storage.CompressedManifestStaticFilesStorage"
+    )
+    call_command("collectstatic", interactive=False, stdout=StringIO())
+
+    css = next((tmp_path / "admin" / "css").glob("base.*.css"))
+    hashed_name = f"admin/css/{css.name}"
+    assert (
+        tmp_path / f"{hashed_name}.gz"
+    ).exists(), (
+        "Убедитесь, что collectstatic кладёт рядом с файлами gzip-копии."
+    )
+
+    request = RequestFactory().get(
+        f"/static/{hashed_name}", HTTP_ACCEPT_ENCODING="gzip, deflate"
+    )
+    response = serve_static(request, hashed_name)
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"].startswith("text/css")
+    assert response["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert "Accept-Encoding" in response["Vary"]
+    assert gzip.decompress(_body(response)) == css.read_bytes()
+
+    plain = serve_static(RequestFactory().get("/"), hashed_name)
+    assert "Content-Encoding" not in plain
+    assert _body(plain) == css.read_bytes()
+
+
+def test_static_cache_follows_manifest(settings, tmp_path, monkeypatch):
+    settings.STATIC_ROOT = tmp_path
+    hashed_name = "site.0123456789ab.css"
+    (tmp_path / hashed_name).write_text("body {}")
+    manifest = {}
+    monkeypatch.setattr(
+        staticfiles_storage, "hashed_files", manifest, raising=False
+    )
+    request = RequestFactory().get(f"/static/{hashed_name}")
+    response = serve_static(request, hashed_name)
+    assert response["Cache-Control"] == REVALIDATE_CACHE_CONTROL
+
+    manifest["site.css"] = hashed_name
+    response = serve_static(request, hashed_name)
+    assert response["Cache-Control"] == IMMUTABLE_CACHE_CONTROL, (
+        "Убедитесь, что файл, добавленный в манифест статики, кешируется "
+        "навсегда."
+    )
@@ -0,0 +1,39 @@
+import sqlite3
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from blog.db import apply_pragmas
+
+
+def _pragma(cursor, name):
+    cursor.execute(f"PRAGMA {name}")
+    return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_connection_is_tuned():
+    with connection.cursor() as cursor:
+        assert (
+            _pragma(cursor, "synchronous") == 1
+        ), "Убедитесь, что для SQLite включён synchronous=NORMAL."
+        assert _pragma(cursor, "busy_timeout") == 5000
+        assert _pragma(cursor, "temp_store") == 2
+        assert _pragma(cursor, "cache_size") == -20000
+
+
+def test_file_database_switches_to_wal(tmp_path, settings):
+    db = sqlite3.connect(tmp_path / "db.sqlite3")
+    apply_pragmas(db, settings.BLOG_SQLITE_PRAGMAS)
+    assert _pragma(db.cursor(), "journal_mode") == "wal"
+    db.close()
+
+
+@pytest.mark.parametrize(
+    "pragmas",
+    [{"journal_mode; DROP TABLE x": "WAL"}, {"synchronous": "0; DROP"}],
+)
+def test_rejects_malformed_pragmas(pragmas):
+    with pytest.raises(ImproperlyConfigured):
+        apply_pragmas(sqlite3.connect(":memory:"), pragmas)
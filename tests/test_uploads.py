@@ -0,0 +1,161 @@
+import struct
+import zlib
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.client import Client
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("media_root")]
+
+
+def _png_chunk(kind, data):
+    body = kind + data
+    return (
+        struct.pack(">I", len(data))
+        + body
+        + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+    )
+
+
+def png_bomb(width=12_000, height=12_000):
+    """PNG-заголовок с огромными размерами и почти без данных."""
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", header)
+        + _png_chunk(b"IDAT", zlib.compress(b"\x00" * 1024))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def _jpeg(size=(800, 600)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(73, 109, 137)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _post_data(category, image):
+    return {
+        "title": "Пост с картинкой",
+        "text": "Текст",
+        "category": category.id,
+        "is_published": True,
+        "pub_date": (timezone.now() - timedelta(hours=1)).strftime(
+            "%Y-%m-%dT%H:%M"
+        ),
+        "image": image,
+    }
+
+
+def test_oversized_upload_is_rejected(
+    settings, user_client, published_category
+):
+    settings.BLOG_IMAGE_MAX_UPLOAD_SIZE = 64 * 1024
+    content = _jpeg() + b"\x00" * (200 * 1024)
+    response = user_client.post(
+        "/posts/create/",
+        data=_post_data(
+            published_category,
+            SimpleUploadedFile("big.jpg", content, content_type="image/jpeg"),
+        ),
+    )
+    assert response.status_code == 200
+    assert "image" in response.context["form"].errors, (
+        "Убедитесь, что слишком большой файл отклоняется с ошибкой в поле "
+        "`image`, а не сохраняется пост без картинки."
+    )
+    assert not Post.objects.exists()
+
+
+def test_decompression_bomb_is_rejected_by_header(
+    user_client, published_category
+):
+    response = user_client.post(
+        "/posts/create/",
+        data=_post_data(
+            published_category,
+            SimpleUploadedFile(
+                "bomb.png", png_bomb(), content_type="image/png"
+            ),
+        ),
+    )
+    assert response.status_code == 200
+    errors = response.context["form"].errors.get("image", [])
+    assert any("12000×12000" in error for error in errors), (
+        "Убедитесь, что изображение с огромными размерами отклоняется по "
+        "заголовку, до декодирования."
+    )
+    assert not Post.objects.exists()
+
+
+def test_pillow_decompression_bomb_is_rejected(
+    user_client, published_category
+):
+    response = user_client.post(
+        "/posts/create/",
+        data=_post_data(
+            published_category,
+            SimpleUploadedFile(
+                "bomb.png", png_bomb(50_000, 50_000), content_type="image/png"
+            ),
+        ),
+    )
+    assert response.status_code == 200
+    assert "image" in response.context["form"].errors
+    assert not Post.objects.exists()
+
+
+def test_edit_post_rejects_bomb(user_client, post_with_published_location):
+    post = post_with_published_location
+    image_name = post.image.name
+    response = user_client.post(
+        f"/posts/{post.id}/edit/",
+        data=_post_data(
+            post.category,
+            SimpleUploadedFile(
+                "bomb.png", png_bomb(), content_type="image/png"
+            ),
+        ),
+    )
+    assert response.status_code == 200
+    assert "image" in response.context["form"].errors
+    post.refresh_from_db()
+    assert post.image.name == image_name
+
+
+def test_regular_upload_is_accepted(user_client, published_category):
+    user_client.post(
+        "/posts/create/",
+        data=_post_data(
+            published_category,
+            SimpleUploadedFile(
+                "photo.jpg", _jpeg(), content_type="image/jpeg"
+            ),
+        ),
+    )
+    post = Post.objects.get(title="Пост с картинкой")
+    assert post.image
+
+
+def test_csrf_is_still_checked(user, published_category):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    response = client.post(
+        "/posts/create/",
+        data=_post_data(
+            published_category,
+            SimpleUploadedFile(
+                "photo.jpg", _jpeg(), content_type="image/jpeg"
+            ),
+        ),
+    )
+    assert response.status_code == 403, (
+        "Убедитесь, что замена обработчиков загрузки не отключает проверку "
+        "CSRF-токена."
+    )